@@ -1,21 +1,35 @@
-from boto3 import client
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from json import dumps
 from os import getenv
-from dotenv import load_dotenv
 
 from .utils.misc import get_lambda_usage_constraints, \
     get_trust_policy, get_calling_module_folder
 from .utils.iam_utils import try_attach_role_policy
-from .utils.ecr_utils import pipe_docker_image_to_ecr
+from .utils.ecr_utils import pipe_docker_image_to_ecr, build_context_tag
 from .utils.lambda_utils import update_or_deploy_lambda_function, \
-    get_lambda_arn, \
+    build_lambda_arn, \
     build_lambda_uri
 from .utils.api_gateway_utils import deploy_rest_api, \
     add_apigateway_permission, \
-    build_api_url
+    has_apigateway_permission, \
+    build_api_url, \
+    build_source_arn
 from .utils.misc import timing
+from .utils.state_utils import build_state_key, get_deployment_state, \
+    save_deployment_state
+from .types import AccountInfo, ActivityInfo, ConfigurationInfo, \
+    Configuration, DeployEnvironment
+from .utils.clients import get_client
+
+# Role ARNs already attached during this process, by IAM role name and trust policy
+ROLE_ARN_CACHE = {}
+
+# Lambda function and API Gateway source ARN pairs already allowed during this process
+API_ALLOWANCE_CACHE = set()
 
 @timing("ECR image upload")
-def do_ecr_update(aws_account_id_, aws_region_, ecr_image_name_):
+def do_ecr_update(aws_account_id_, aws_region_, ecr_image_name_, context_tag_=None):
     """
     Perform the ECR update workflow, including creating and pushing a Docker image to AWS ECR.
 
@@ -23,10 +37,14 @@ def do_ecr_update(aws_account_id_, aws_region_, ecr_image_name_):
     - aws_account_id_ (str): AWS account ID.
     - aws_region_ (str): AWS region.
     - ecr_image_name_ (str): The name of the ECR repository.
+    - context_tag_ (str, optional): The build context tag, if already computed. \
+        If None (default), it is computed by the upload.
     """
 
     # The id "role_arn" will be used on lambda deployment
-    routed_url = pipe_docker_image_to_ecr(aws_account_id_, aws_region_, ecr_image_name_)
+    routed_url = pipe_docker_image_to_ecr(
+        aws_account_id_, aws_region_, ecr_image_name_, context_tag_=context_tag_
+    )
 
     return routed_url
 
@@ -35,6 +53,8 @@ def do_iam_update(iam_client_, iam_role_name_, trust_policy):
     """
     Perform the IAM role update workflow, including creating or attaching a role policy.
 
+    The workflow runs once per IAM role and trust policy: later calls return the cached role ARN.
+
     Parameters:
     - iam_client_ (boto3.client): AWS IAM client.
     - iam_role_name_ (str): The name of the IAM role.
@@ -43,15 +63,24 @@ def do_iam_update(iam_client_, iam_role_name_, trust_policy):
     Returns:
     str: The ARN (Amazon Resource Name) of the IAM role with the attached policy.
     """
+    # The role state is invariant across deployments sharing role and trust policy
+    cache_key = (iam_role_name_, dumps(trust_policy, sort_keys=True))
+
+    if cache_key in ROLE_ARN_CACHE:
+        return ROLE_ARN_CACHE[cache_key]
+
     # The id "role_arn" will be used on lambda deployment
     role_arn = try_attach_role_policy(
         iam_client_, iam_role_name_, trust_policy)
 
+    if role_arn:
+        ROLE_ARN_CACHE[cache_key] = role_arn
+
     return role_arn
 
 @timing("Lambda function deployment")
 def do_lambda_update(
-    lambda_client_, routed_ecr_url_, \
+    lambda_client_, aws_account_id_, routed_ecr_url_, \
     lambda_function_name_, lambda_function_description_, role_arn_
 ):
     """
@@ -59,10 +88,9 @@ def do_lambda_update(
 
     Parameters:
     - lambda_client_ (boto3.client): AWS Lambda client.
+    - aws_account_id_ (str): AWS account ID.
     - routed_ecr_url_ (str): The uri of the ECR repository.
     - lambda_function_name_ (str): The name of the Lambda function.    
-    - aws_account_id (str): AWS account ID.
-    - aws_region (str): AWS region.
     - role_arn (str): The ARN of the IAM role associated with the Lambda function.
 
     Returns:
@@ -74,11 +102,12 @@ def do_lambda_update(
         routed_ecr_url_, role_arn_
     )
 
-    # Get the Lambda function ARN
-    lambda_arn = get_lambda_arn(lambda_client_, lambda_function_name_)
+    # Build the Lambda function ARN locally: it is fully determined by region,
+    # account and function name, so no GetFunction round trip is needed
+    aws_region_=lambda_client_.meta.region_name
+    lambda_arn = build_lambda_arn(aws_region_, aws_account_id_, lambda_function_name_)
 
     # Set up integration with the Lambda function
-    aws_region_=lambda_client_.meta.region_name
     lambda_uri = build_lambda_uri(aws_region_, lambda_arn)
 
     return lambda_uri
@@ -87,11 +116,15 @@ def do_lambda_update(
 def do_api_update(
     gateway_client_, aws_account_id_, aws_region_,
     lambda_uri_, lambda_function_name_,
-    rest_api_name_, endpoint_, method_verb_, stage_name_, usage_constraints_
+    rest_api_name_, endpoint_, method_verb_, stage_name_, usage_constraints_,
+    on_rest_api_id_=None
 ):
     """
     Perform the API Gateway update workflow, including deploying an API Gateway with a new Lambda integration.
 
+    The REST API and usage plan IDs of the last deployment are persisted (see `state_utils`)
+    and reused while recent.
+
     Parameters:
     - gateway_client_ (boto3.client): AWS API Gateway client.
     - aws_account_id_ (str): AWS account ID.
@@ -102,23 +135,36 @@ def do_api_update(
     - method_verb_ (str): The HTTP method (HTTP verb) for the integration.
     - stage_name_ (str): The deployment stage of the API.
     - usage_constraints_ (dict): Usage constraints, including rate limits and quotas.
+    - on_rest_api_id_ (callable, optional): Called with the REST API ID as soon as it is known.
 
     Returns:
-    dict: Information about the deployed API, including its URL, API key, usage plan ID, REST API ID, and ARN.
+    DeployedApi: Information about the deployed API, including its URL, API key, usage plan ID, REST API ID, and ARN.
     """
 
+    # A recent deployment state spares the REST API and usage plan lookups by name
+    state_key = build_state_key(aws_account_id_, aws_region_, rest_api_name_)
+    deployment_state = get_deployment_state(state_key) or {}
+
     # Deploys lambda function as API Gateway endpoint
     api_deployment_reponse = deploy_rest_api(
         gateway_client_, aws_account_id_, aws_region_,
         lambda_uri_, rest_api_name_, endpoint_, method_verb_,
         stage_name_, usage_constraints_,
+        rest_api_id_=deployment_state.get("rest_api_id"),
+        on_rest_api_id_=on_rest_api_id_,
+        usage_plan_id_=deployment_state.get("usage_plan_id"),
     )
 
+    save_deployment_state(state_key, {
+        "rest_api_id": api_deployment_reponse.rest_api_id,
+        "usage_plan_id": api_deployment_reponse.usage_plan_id,
+    })
+
     return api_deployment_reponse
 
 def do_api_allowance(l_client, lambda_function_name, api_arn):
     """
-    Allow API Gateway to access a Lambda function by adding permission.
+    Allow API Gateway to access a Lambda function by adding permission, unless already granted.
 
     Parameters:
     - l_client (boto3.client): AWS Lambda client.
@@ -129,85 +175,148 @@ def do_api_allowance(l_client, lambda_function_name, api_arn):
     None
     """
 
-    try:
-        add_apigateway_permission(l_client, lambda_function_name, api_arn)
-    except l_client.exceptions.ResourceConflictException:
-        pass
+    allowance_key = (lambda_function_name, api_arn)
+
+    # Skip the permission call (and its conflict error) when it is already granted
+    if allowance_key in API_ALLOWANCE_CACHE:
+        return
+
+    if not has_apigateway_permission(l_client, lambda_function_name, api_arn):
+        try:
+            add_apigateway_permission(l_client, lambda_function_name, api_arn)
+        except l_client.exceptions.ResourceConflictException:
+            pass
+
+    API_ALLOWANCE_CACHE.add(allowance_key)
+
+def report_api_allowance_error(allowance_future):
+    """
+    Report the failure of a background API Gateway permission grant, if any.
+
+    Parameters:
+    - allowance_future (concurrent.futures.Future): The future of the `do_api_allowance` call.
+
+    Returns:
+    None
+    """
+
+    error = allowance_future.exception()
+
+    if error is not None:
+        print(f"Failed to allow API Gateway access to Lambda function: {error}")
 
 @timing("Deployment of ML solution")
-def deploy_api_endpoint(account_info, activity_info, configuration_info):
+def deploy_api_endpoint(
+    account_info, activity_info, configuration_info, sync_allowance=True, ecr_future=None
+):
     """
     Deploy a machine learning solution by updating ECR, IAM, Lambda, and API Gateway configurations.
 
     Parameters:
-    - account_info (dict): Information about the AWS account, including account ID, region, and IAM role.
-    - activity_info (dict): Information about the machine learning activity, including image name, \
+    - account_info (AccountInfo): Information about the AWS account, including account ID, region, and IAM role.
+    - activity_info (ActivityInfo): Information about the machine learning activity, including image name, \
         Lambda function description, endpoint, method, and stage.
-    - configuration_info (dict): Configuration objects (trust policy and usage constraints)
+    - configuration_info (Configuration): Configuration objects (trust policy and usage constraints)
+    - sync_allowance (bool, optional): If True (default), wait for the API Gateway permission \
+        on the Lambda function before returning. If False, the permission is granted in background.
+    - ecr_future (concurrent.futures.Future, optional): A running `do_ecr_update` call, whose \
+        result is the routed ECR URL. If None, the ECR upload is started here.
 
     Returns:
     dict: Information about the deployed solution, including API key, API URL, and HTTP method.
     """
 
     # AWS account information
-    aws_account_id_ = account_info["account_id"]
-    aws_region_ = account_info["region"]
-    iam_role_name_ = account_info["iam_role"]
+    aws_account_id_ = account_info.account_id
+    aws_region_ = account_info.region
+    iam_role_name_ = account_info.iam_role
 
     # Set up the IAM client
-    iam_client_ = client("iam", region_name=aws_region_)
+    iam_client_ = get_client("iam", aws_region_)
 
     # Set up the Lambda client
-    lambda_client_ = client("lambda", region_name=aws_region_)
+    lambda_client_ = get_client("lambda", aws_region_)
 
     # Set up the API Gateway client
-    gateway_client_ = client("apigateway", region_name=aws_region_)
+    gateway_client_ = get_client("apigateway", aws_region_)
 
     # Activity information
-    ecr_image_name_ = activity_info["image_name"]
-    lambda_function_name_ = activity_info["lambda_function_name"]
-    lambda_function_description_ = activity_info["lambda_function_description"]
-    rest_api_name_ = activity_info["rest_api_name"]
-    endpoint_ = activity_info["endpoint"]
-    method_verb_ = activity_info["method_verb"]
-    stage_name_ = activity_info["stage"]
+    ecr_image_name_ = activity_info.image_name
+    lambda_function_name_ = activity_info.lambda_function_name
+    lambda_function_description_ = activity_info.lambda_function_description
+    rest_api_name_ = activity_info.rest_api_name
+    endpoint_ = activity_info.endpoint
+    method_verb_ = activity_info.method_verb
+    stage_name_ = activity_info.stage
 
-    usage_constraints = configuration_info["usage_constraints"]
-    trust_policy = configuration_info["trust_policy"]
+    usage_constraints = configuration_info.usage_constraints
+    trust_policy = configuration_info.trust_policy
 
     # Deployment pipeline steps:
+    # NOTE: Steps 1 and 2 have no data dependency on each other, run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # 1. Creates docker image and uploads to ECR (unless the caller already started it)
+        if ecr_future is None:
+            ecr_future = executor.submit(
+                do_ecr_update, aws_account_id_, aws_region_, ecr_image_name_
+            )
+
+        # 2. Updates iam permissions
+        iam_future = executor.submit(
+            do_iam_update, iam_client_, iam_role_name_, trust_policy
+        )
+
+        routed_ecr_url = ecr_future.result()
+        role_arn_ = iam_future.result()
 
-    # 1. Creates docker image and uploads to ECR
-    routed_ecr_url = do_ecr_update(aws_account_id_, aws_region_, ecr_image_name_)
-
-    # 2. Updates iam permissions
-    role_arn_ = do_iam_update(iam_client_, iam_role_name_, trust_policy)
-    
     # 3. Downloads respective ECR image and links to an
     lambda_uri_ = do_lambda_update(
-        lambda_client_, routed_ecr_url, 
+        lambda_client_, aws_account_id_, routed_ecr_url,
         lambda_function_name_, lambda_function_description_, role_arn_
     )
 
-    # 4. Updates API Gateway endpoint
-    # Rate limits: Harsh since this will be public facing
-    # Quota: Low daily limits for the same reason
-    api_deployment_reponse = do_api_update(
-        gateway_client_, aws_account_id_, aws_region_,
-        lambda_uri_, lambda_function_name_, rest_api_name_,
-        endpoint_, method_verb_, stage_name_, usage_constraints
-    )
-    
-    # 5. Allow API Gateway to access Lambda function
-    api_arn = api_deployment_reponse["arn"]
-    do_api_allowance(lambda_client_, lambda_function_name_, api_arn)
+    allowance_executor = ThreadPoolExecutor(max_workers=1)
+    allowance_futures = []
 
-    # Retrieve information from
-    rest_api_id = api_deployment_reponse["rest_api_id"]
-    api_key = api_deployment_reponse["api_key"]
+    def start_api_allowance(rest_api_id):
+        # 5. Allow API Gateway to access Lambda function
+        # NOTE: It only needs the API ARN, so it overlaps with the rest of the API setup
+        api_arn = build_source_arn(aws_region_, aws_account_id_, rest_api_id)
+        allowance_future = allowance_executor.submit(
+            do_api_allowance, lambda_client_, lambda_function_name_, api_arn
+        )
 
-    # The URL by default will follow this pattern:
-    api_url = build_api_url(rest_api_id, aws_region_, endpoint_, stage_name_)
+        # In background mode, nobody waits on the grant: report its failure instead
+        if not sync_allowance:
+            allowance_future.add_done_callback(report_api_allowance_error)
+
+        allowance_futures.append(allowance_future)
+
+    try:
+        # 4. Updates API Gateway endpoint
+        # Rate limits: Harsh since this will be public facing
+        # Quota: Low daily limits for the same reason
+        api_deployment_reponse = do_api_update(
+            gateway_client_, aws_account_id_, aws_region_,
+            lambda_uri_, lambda_function_name_, rest_api_name_,
+            endpoint_, method_verb_, stage_name_, usage_constraints,
+            on_rest_api_id_=start_api_allowance
+        )
+
+        # Retrieve information from
+        rest_api_id = api_deployment_reponse.rest_api_id
+        api_key = api_deployment_reponse.api_key
+
+        # The URL by default will follow this pattern:
+        api_url = build_api_url(rest_api_id, aws_region_, endpoint_, stage_name_)
+
+        # A failed permission grant fails the deployment: the endpoint could not invoke the function
+        if sync_allowance:
+            for allowance_future in allowance_futures:
+                allowance_future.result()
+
+    finally:
+        allowance_executor.shutdown(wait=sync_allowance)
 
     return {
         "api_key": api_key,
@@ -216,25 +325,120 @@ def deploy_api_endpoint(account_info, activity_info, configuration_info):
     }
 
 
-def do_deploy(account_info, activity_info_, configuration_info_):
+def load_configuration(configuration_info_):
+    """
+    Load the trust policy and usage constraints of a deployment.
 
-    # Load environment variables from .env
-    trust_policy_path=configuration_info_["trust_policy_path"]
-    usage_constraints_path=configuration_info_["usage_constraints_path"]
+    Parameters:
+    - configuration_info_ (ConfigurationInfo): Paths to the trust policy and usage constraints folders.
 
-    # Load environment variables from .env, usage constraints and trust policy
-    usage_constraints = get_lambda_usage_constraints(usage_constraints_path)
-    trust_policy = get_trust_policy(trust_policy_path)
+    Returns:
+    Configuration: The loaded trust policy and usage constraints.
+    """
 
-    configuration={
-        "usage_constraints": usage_constraints,
-        "trust_policy": trust_policy
-    }
+    return Configuration(
+        trust_policy=get_trust_policy(configuration_info_.trust_policy_path),
+        usage_constraints=get_lambda_usage_constraints(configuration_info_.usage_constraints_path)
+    )
 
-    deployment_info = deploy_api_endpoint(account_info, activity_info_, configuration)
+def do_deploy(account_info, activity_info_, configuration_info_):
+
+    # The ECR upload is the longest step: start it before anything else
+    with ThreadPoolExecutor(max_workers=1) as ecr_executor:
+        ecr_future = ecr_executor.submit(
+            do_ecr_update,
+            account_info.account_id, account_info.region, activity_info_.image_name
+        )
+
+        # Load usage constraints and trust policy
+        configuration = load_configuration(configuration_info_)
+
+        deployment_info = deploy_api_endpoint(
+            account_info, activity_info_, configuration, ecr_future=ecr_future
+        )
 
     return deployment_info
 
+def deploy_many(account_info, activities_info, configuration_info_, max_concurrency=10):
+    """
+    Deploy several machine learning solutions of the same AWS account concurrently.
+
+    Parameters:
+    - account_info (AccountInfo): Information about the AWS account, including account ID, region, and IAM role.
+    - activities_info (list): A list of `ActivityInfo` objects, as expected by `do_deploy`.
+    - configuration_info_ (ConfigurationInfo): Paths to the trust policy and usage constraints folders.
+    - max_concurrency (int, optional): Maximum number of deployments in flight (default is 10).
+
+    Returns:
+    list: Information about each deployed solution, in the same order as `activities_info`.
+    """
+
+    # Usage constraints and trust policy are shared by the whole batch
+    configuration = load_configuration(configuration_info_)
+
+    # The IAM role is identical for the whole batch: attach it once, up front
+    do_iam_update(
+        get_client("iam", account_info.region),
+        account_info.iam_role, configuration.trust_policy
+    )
+
+    # The build context is shared by the whole batch: hash it once
+    context_tag = build_context_tag()
+
+    # NOTE: Docker pipelines share the working directory and the local images,
+    # so the ECR uploads run one at a time, once per image, while the other stages overlap
+    with ThreadPoolExecutor(max_workers=1) as ecr_executor:
+        ecr_futures = {}
+
+        for activity_info_ in activities_info:
+            image_name = activity_info_.image_name
+
+            if image_name not in ecr_futures:
+                ecr_futures[image_name] = ecr_executor.submit(
+                    do_ecr_update,
+                    account_info.account_id, account_info.region, image_name, context_tag
+                )
+
+        def deploy_activity(activity_info_):
+            return deploy_api_endpoint(
+                account_info, activity_info_, configuration,
+                ecr_future=ecr_futures[activity_info_.image_name]
+            )
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            deployments_info = list(executor.map(deploy_activity, activities_info))
+
+    return deployments_info
+
+@lru_cache(maxsize=16)
+def load_deploy_environment(info_environment_path):
+    """
+    Load the deployment settings from an environment file, parsing it only once per path.
+
+    Parameters:
+    - info_environment_path (str): The path to the environment file.
+
+    Returns:
+    DeployEnvironment: The deployment settings.
+    """
+
+    from dotenv import load_dotenv
+
+    load_dotenv(info_environment_path)
+
+    return DeployEnvironment(
+        aws_account_id=getenv("AWS_ACCOUNT_ID"),
+        aws_region=getenv("AWS_REGION"),
+        iam_role_name=getenv("IAM_ROLE_NAME"),
+        ecr_image_name=getenv("ECR_IMAGE_NAME"),
+        lambda_name=getenv("LAMBDA_NAME"),
+        lambda_description=getenv("LAMBDA_DESCRIPTION"),
+        lambda_method_verb=getenv("LAMBDA_METHOD_VERB"),
+        api_name=getenv("API_NAME"),
+        api_stage=getenv("API_STAGE"),
+        api_endpoint=getenv("API_ENDPOINT"),
+    )
+
 def deploy_application(info_environment_path):
     """
     Deploy an application by retrieving environment variables, constructing deployment information,
@@ -271,36 +475,23 @@ def deploy_application(info_environment_path):
 
     """
     
-    load_dotenv(info_environment_path)
-    aws_account_id = getenv("AWS_ACCOUNT_ID")
-    aws_region = getenv("AWS_REGION")
-    iam_role_name = getenv("IAM_ROLE_NAME")
-
-    ecr_image_name=getenv('ECR_IMAGE_NAME')
+    environment = load_deploy_environment(info_environment_path)
 
-    lambda_name=getenv('LAMBDA_NAME')
-    lambda_description=getenv('LAMBDA_DESCRIPTION')
-    lambda_method_verb=getenv('LAMBDA_METHOD_VERB')
-    
-    api_name=getenv('API_NAME')
-    api_stage=getenv('API_STAGE')
-    api_endpoint=getenv('API_ENDPOINT')
-
-    account_info={
-        "account_id": aws_account_id,
-        "region": aws_region,
-        "iam_role":iam_role_name
-    }
+    account_info = AccountInfo(
+        account_id=environment.aws_account_id,
+        region=environment.aws_region,
+        iam_role=environment.iam_role_name
+    )
 
-    activity_info = {
-        'image_name': ecr_image_name,
-        "lambda_function_name": lambda_name,
-        'lambda_function_description': lambda_description,
-        "rest_api_name": api_name,
-        'stage': api_stage,
-        'method_verb': lambda_method_verb,
-        'endpoint': api_endpoint                
-    }
+    activity_info = ActivityInfo(
+        image_name=environment.ecr_image_name,
+        lambda_function_name=environment.lambda_name,
+        lambda_function_description=environment.lambda_description,
+        rest_api_name=environment.api_name,
+        stage=environment.api_stage,
+        method_verb=environment.lambda_method_verb,
+        endpoint=environment.api_endpoint
+    )
 
     # Base folder for trust policy and usage constraints
     # NOTE: Files must have name as below:
@@ -308,9 +499,9 @@ def deploy_application(info_environment_path):
     #   - trust_policy.
     calling_module_folder = get_calling_module_folder(__file__)
     
-    configuration_info={
-        'trust_policy_path': calling_module_folder,
-        'usage_constraints_path': calling_module_folder
-    }
+    configuration_info = ConfigurationInfo(
+        trust_policy_path=calling_module_folder,
+        usage_constraints_path=calling_module_folder
+    )
     
     return do_deploy(account_info, activity_info, configuration_info)
\ No newline at end of file
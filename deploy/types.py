@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class AccountInfo:
+    """
+    Information about the AWS account the solution is deployed on.
+
+    Attributes:
+    - account_id (str): AWS account ID.
+    - region (str): AWS region.
+    - iam_role (str): IAM role name.
+    """
+    __slots__ = ("account_id", "region", "iam_role")
+
+    account_id: str
+    region: str
+    iam_role: str
+
+@dataclass(frozen=True)
+class ActivityInfo:
+    """
+    Information about the machine learning activity to deploy.
+
+    Attributes:
+    - image_name (str): ECR image name.
+    - lambda_function_name (str): Lambda function name.
+    - lambda_function_description (str): Lambda function description.
+    - rest_api_name (str): API Gateway name.
+    - endpoint (str): API Gateway endpoint.
+    - method_verb (str): The HTTP method (HTTP verb) of the endpoint.
+    - stage (str): API Gateway stage.
+    """
+    __slots__ = (
+        "image_name", "lambda_function_name", "lambda_function_description",
+        "rest_api_name", "endpoint", "method_verb", "stage",
+    )
+
+    image_name: str
+    lambda_function_name: str
+    lambda_function_description: str
+    rest_api_name: str
+    endpoint: str
+    method_verb: str
+    stage: str
+
+@dataclass(frozen=True)
+class ConfigurationInfo:
+    """
+    Location of the configuration files of a deployment.
+
+    Attributes:
+    - trust_policy_path (str): The folder containing the trust policy file.
+    - usage_constraints_path (str): The folder containing the usage constraints file.
+    """
+    __slots__ = ("trust_policy_path", "usage_constraints_path")
+
+    trust_policy_path: str
+    usage_constraints_path: str
+
+@dataclass(frozen=True)
+class Configuration:
+    """
+    Configuration objects of a deployment, as loaded from the configuration files.
+
+    Attributes:
+    - trust_policy (dict): The trust policy document.
+    - usage_constraints (dict): Usage constraints, including rate limits and quotas.
+    """
+    __slots__ = ("trust_policy", "usage_constraints")
+
+    trust_policy: dict
+    usage_constraints: dict
+
+@dataclass(frozen=True)
+class DeployEnvironment:
+    """
+    Deployment settings read from an environment file.
+
+    Attributes:
+    - aws_account_id (str): AWS account ID.
+    - aws_region (str): AWS region.
+    - iam_role_name (str): IAM role name.
+    - ecr_image_name (str): ECR image name.
+    - lambda_name (str): Lambda function name.
+    - lambda_description (str): Lambda function description.
+    - lambda_method_verb (str): Lambda function method verb.
+    - api_name (str): API Gateway name.
+    - api_stage (str): API Gateway stage.
+    - api_endpoint (str): API Gateway endpoint.
+    """
+    __slots__ = (
+        "aws_account_id", "aws_region", "iam_role_name", "ecr_image_name",
+        "lambda_name", "lambda_description", "lambda_method_verb",
+        "api_name", "api_stage", "api_endpoint",
+    )
+
+    aws_account_id: str
+    aws_region: str
+    iam_role_name: str
+    ecr_image_name: str
+    lambda_name: str
+    lambda_description: str
+    lambda_method_verb: str
+    api_name: str
+    api_stage: str
+    api_endpoint: str
+
+@dataclass(frozen=True)
+class DeployedApi:
+    """
+    Information about a REST API deployed on API Gateway.
+
+    Attributes:
+    - url (str): The URL of the endpoint.
+    - api_key (str): The value of the API key.
+    - usage_plan_id (str): The ID of the API usage plan.
+    - rest_api_id (str): The ID of the REST API.
+    - arn (str): The source ARN of the REST API.
+    """
+    __slots__ = ("url", "api_key", "usage_plan_id", "rest_api_id", "arn")
+
+    url: str
+    api_key: str
+    usage_plan_id: str
+    rest_api_id: str
+    arn: str
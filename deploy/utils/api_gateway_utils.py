@@ -1,10 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from json import loads
+import logging
+from random import uniform
+from threading import Lock
+from time import monotonic, sleep, time
+from weakref import WeakKeyDictionary
+
 from botocore.exceptions import ClientError
 
 from .default_values import GATEWAY_DEPLOYMENT_SLEEP_SECONDS, \
-    GATEWAY_DEPLOYMENT_UPDATE_DELAY_SECONDS
+    GATEWAY_DEPLOYMENT_MAX_SLEEP_SECONDS, GATEWAY_DEPLOYMENT_TIME_OUT_SECONDS, \
+    GATEWAY_DEPLOYMENT_UPDATE_DELAY_SECONDS, GATEWAY_PAGE_SIZE, \
+    GATEWAY_DELETE_MAX_WORKERS, GATEWAY_LISTING_TTL_SECONDS, \
+    GATEWAY_CACHE_CLUSTER_SIZE, GATEWAY_CACHE_TTL_SECONDS
+
+from .misc import handle_aws_errors, get_error_code
+from ..types import DeployedApi
+
+logger = logging.getLogger(__name__)
 
-from .misc import handle_aws_errors
+# Snapshots of REST API listings (name to IDs, and the time they were taken), per client
+REST_APIS_LISTINGS = WeakKeyDictionary()
+REST_APIS_LISTINGS_LOCK = Lock()
 
+@lru_cache(maxsize=1024)
 def build_source_arn(region_, account_id_, rest_api_id_):
     """
     Build the Amazon Resource Name (ARN) for an API Gateway source.
@@ -21,6 +41,24 @@ def build_source_arn(region_, account_id_, rest_api_id_):
     return f"arn:aws:execute-api:{region_}:{account_id_}:{rest_api_id_}/*"
 
 
+@lru_cache(maxsize=1024)
+def build_stage_url(rest_api_id, region_, stage_):
+    """
+    Build the invoke URL of an API Gateway stage.
+
+    Parameters:
+    - rest_api_id (str): The ID of the API Gateway REST API.
+    - region_ (str): The AWS region where the API Gateway is located.
+    - stage_ (str): The deployment stage of the API.
+
+    Returns:
+    str: The constructed stage URL.
+    """
+
+    return f"https://{rest_api_id}.execute-api.{region_}.amazonaws.com/{stage_}"
+
+
+@lru_cache(maxsize=1024)
 def build_api_url(rest_api_id, region_, endpoint_, stage_):
     """
     Build the URL for an API Gateway endpoint.
@@ -35,14 +73,86 @@ def build_api_url(rest_api_id, region_, endpoint_, stage_):
     str: The constructed API URL.
     """
 
-    protocol = "https"
-    host_url = f"{rest_api_id}.execute-api.{region_}.amazonaws.com"
-    host = f"{protocol}://{host_url}"
-    route = f"{stage_}/{endpoint_}/"
-    
-    url=f"{host}/{route}"
-    
-    return url
+    return f"{build_stage_url(rest_api_id, region_, stage_)}/{endpoint_}/"
+
+def iter_rest_apis(g_client):
+    """
+    Iterate over the REST APIs of an account, fetching pages lazily.
+
+    Parameters:
+    - g_client (boto3.client): AWS API Gateway client.
+
+    Yields:
+    dict: The description of a REST API, as returned by `get_rest_apis`.
+    """
+
+    paginator = g_client.get_paginator("get_rest_apis")
+    pages = paginator.paginate(PaginationConfig={"PageSize": GATEWAY_PAGE_SIZE})
+
+    # Only one page is held at a time; stopping early skips the remaining pages
+    for page in pages:
+        yield from page["items"]
+
+
+def list_rest_apis(g_client):
+    """
+    List the REST APIs of an account by name, reusing a recent listing when available.
+
+    Parameters:
+    - g_client (boto3.client): AWS API Gateway client.
+
+    Returns:
+    dict: The IDs of the REST APIs (list of str), by API name. It must not be mutated.
+    """
+
+    with REST_APIS_LISTINGS_LOCK:
+        listing = REST_APIS_LISTINGS.get(g_client)
+
+    if listing is not None and monotonic() - listing[0] <= GATEWAY_LISTING_TTL_SECONDS:
+        return listing[1]
+
+    api_ids_by_name = {}
+
+    for item in iter_rest_apis(g_client):
+        api_ids_by_name.setdefault(item["name"], []).append(item["id"])
+
+    with REST_APIS_LISTINGS_LOCK:
+        REST_APIS_LISTINGS[g_client] = (monotonic(), api_ids_by_name)
+
+    return api_ids_by_name
+
+
+def invalidate_rest_apis_listing(g_client):
+    """
+    Discard the REST API listing snapshot of a client, after APIs are created or deleted.
+
+    Parameters:
+    - g_client (boto3.client): AWS API Gateway client.
+    """
+
+    with REST_APIS_LISTINGS_LOCK:
+        REST_APIS_LISTINGS.pop(g_client, None)
+
+def iter_resources(g_client, rest_api_id_):
+    """
+    Iterate over the resources of a REST API, fetching pages lazily.
+
+    Parameters:
+    - g_client (boto3.client): AWS API Gateway client.
+    - rest_api_id_ (str): The ID of the API Gateway REST API.
+
+    Yields:
+    dict: The description of a resource, as returned by `get_resources`.
+    """
+
+    paginator = g_client.get_paginator("get_resources")
+    pages = paginator.paginate(
+        restApiId=rest_api_id_,
+        PaginationConfig={"PageSize": GATEWAY_PAGE_SIZE}
+    )
+
+    for page in pages:
+        yield from page["items"]
 
 @handle_aws_errors
 def delete_apis_by_name(g_client, rest_api_name):
@@ -54,20 +164,23 @@ def delete_apis_by_name(g_client, rest_api_name):
     - rest_api_name (str): The name of the API to delete.
 
     Note:
-    This function retrieves all APIs and deletes those with the specified name.
+    This function retrieves all APIs and deletes those with the specified name, concurrently.
     """
 
-    # Get all APIs
-    response = g_client.get_rest_apis()
+    api_ids = list_rest_apis(g_client).get(rest_api_name, [])
 
-    for item in response["items"]:
-        if item["name"] == rest_api_name:
-            # Delete the API by its ID
-            api_id = item["id"]
-            g_client.delete_rest_api(restApiId=api_id)
-            print(f"Deleted API with name '{rest_api_name}' and ID '{api_id}'")
+    def delete_api(api_id):
+        # Delete the API by its ID
+        g_client.delete_rest_api(restApiId=api_id)
+        logger.info("Deleted API with name '%s' and ID '%s'", rest_api_name, api_id)
+
+    try:
+        # Deletions are independent: issue them concurrently
+        with ThreadPoolExecutor(max_workers=GATEWAY_DELETE_MAX_WORKERS) as executor:
+            list(executor.map(delete_api, api_ids))
+    finally:
+        invalidate_rest_apis_listing(g_client)
 
-@handle_aws_errors
 def has_api(g_client, rest_api_name_):
     """
     Check if an API Gateway API with a given name exists.
@@ -78,20 +191,32 @@ def has_api(g_client, rest_api_name_):
 
     Returns:
     bool: True if the API exists, False otherwise.
+
+    Raises:
+    ClientError, BotoCoreError: If the listing fails, so that a failed lookup never reads as "not found".
     """
 
-    response = g_client.get_rest_apis()
-    create_api_on_gateway = False
+    return rest_api_name_ in list_rest_apis(g_client)
+
+def rest_api_exists(g_client, rest_api_id_):
+    """
+    Check if a REST API with a given ID exists, with a single lookup.
 
-    for item in response["items"]:
-        if item["name"] == rest_api_name_:
-            create_api_on_gateway = True
+    Parameters:
+    - g_client (boto3.client): AWS API Gateway client.
+    - rest_api_id_ (str): The ID of the REST API.
 
-    return create_api_on_gateway
+    Returns:
+    bool: True if the API exists, False otherwise.
+    """
 
+    try:
+        g_client.get_rest_api(restApiId=rest_api_id_)
+    except g_client.exceptions.NotFoundException:
+        return False
 
+    return True
 
-@handle_aws_errors
 def get_rest_api_id_by_name(g_client, rest_api_name):
     """
     Get the ID of a REST API by its name.
@@ -102,16 +227,15 @@ def get_rest_api_id_by_name(g_client, rest_api_name):
 
     Returns:
     str: The ID of the REST API if found, or None if not found.
+
+    Raises:
+    ClientError, BotoCoreError: If the listing fails, so that a failed lookup never creates a duplicate API.
     """
-    response = g_client.get_rest_apis()
-    
-    for api in response["items"]:
-        if api["name"] == rest_api_name:
-            return api["id"]
 
-    return None
+    api_ids = list_rest_apis(g_client).get(rest_api_name)
+
+    return api_ids[0] if api_ids else None
 
-@handle_aws_errors
 def get_resource_id_by_name(g_client, rest_api_id, resource_name):
     """
     Get the ID of a resource within a REST API by its name.
@@ -123,18 +247,20 @@ def get_resource_id_by_name(g_client, rest_api_id, resource_name):
 
     Returns:
     str: The ID of the resource if found, or None if not found.
-    """
-    response = g_client.get_resources(restApiId=rest_api_id)
-    
-    for resource in response["items"]:
-        pathPart=resource.get('pathPart', '')
 
-        if pathPart == resource_name:
-            return resource["id"]
-
-    return None
+    Raises:
+    ClientError, BotoCoreError: If the listing fails, so that a failed lookup never creates a duplicate resource.
+    """
+    # Stop on the first match: the remaining pages are never fetched
+    return next(
+        (
+            resource["id"] for resource in iter_resources(g_client, rest_api_id)
+            if resource.get("pathPart", "") == resource_name
+        ),
+        None
+    )
 
-def create_endpoint_resource(g_client, rest_api_id_, endpoint_):
+def create_endpoint_resource(g_client, rest_api_id_, endpoint_, root_id_=None):
     """
     Create a resource within an API Gateway.
 
@@ -142,36 +268,38 @@ def create_endpoint_resource(g_client, rest_api_id_, endpoint_):
     - g_client (boto3.client): AWS API Gateway client.
     - rest_api_id_ (str): The ID of the API Gateway REST API.
     - endpoint_ (str): The name of the resource to create.
+    - root_id_ (str, optional): The ID of the root resource ('/'), if already known.
 
     Returns:
     str: The ID of the created resource or the existing resource with the same name.
     """
 
+    resources = None
+
     try:
-        response = g_client.get_resources(restApiId=rest_api_id_)
-        root_id = response["items"][0]["id"]
+        # Only look the root resource up when the caller does not know it
+        if root_id_ is None:
+            resources = list(iter_resources(g_client, rest_api_id_))
+            root_id_ = next(item["id"] for item in resources if item["path"] == "/")
 
         response = g_client.create_resource(
             restApiId=rest_api_id_,
-            parentId=root_id,
+            parentId=root_id_,
             pathPart=endpoint_,
         )
 
         resource_id = response["id"]
     except ClientError as e:
-        error_reponse_code=e.response.get('Error', '').get('Code', '')
-        if error_reponse_code == 'ConflictException':
+        if get_error_code(e) == "ConflictException":
             # Resource with the same name already exists, retrieve its ID
-            existing_resource_name = endpoint_
-            existing_resource_id = None
-            
-            # Find the existing resource ID
-            for item in response["items"]:
-                pathPart=item.get('pathPart', '')
+            if resources is None:
+                resources = list(iter_resources(g_client, rest_api_id_))
 
-                if pathPart == existing_resource_name:
-                    existing_resource_id = item["id"]
-                    break
+            # Find the existing resource ID
+            existing_resource_id = next(
+                (item["id"] for item in resources if item.get("pathPart", "") == endpoint_),
+                None
+            )
 
             if existing_resource_id:
                 resource_id = existing_resource_id
@@ -220,14 +348,18 @@ def create_rest_api(g_client, rest_api_name_):
 
     Returns:
     str: The ID of the created API.
+    str: The ID of the root resource ('/') of the created API.
     """
     description = "API Gateway that triggers a lambda function"
     response = g_client.create_rest_api(
         name=rest_api_name_, description=description)
 
     rest_api_id = response["id"]
+    root_resource_id = response["rootResourceId"]
+
+    invalidate_rest_apis_listing(g_client)
 
-    return rest_api_id
+    return rest_api_id, root_resource_id
 
 
 def setup_integration(
@@ -272,53 +404,59 @@ def setup_integration(
         uri=lambda_uri_,
     )
 
-def check_stage_exists(g_client, rest_api_id_, stage_):
+def create_or_update_deployment(g_client, rest_api_id_, stage_):
     """
-    Check if a deployment stage already exists for an API Gateway.
+    Deploy the current configuration of an API Gateway REST API to a stage.
 
     Parameters:
     - g_client (boto3.client): AWS API Gateway client.
     - rest_api_id_ (str): The ID of the API Gateway REST API.
     - stage_ (str): The deployment stage name.
 
-    Returns:
-    bool: True if the stage exists, False otherwise.
+    Note:
+    A deployment is an immutable snapshot of the API: each call creates a new one and points
+    the stage at it, creating the stage on first deploy. Nothing needs to be looked up first.
     """
-    existing_deployments = g_client.get_deployments(restApiId=rest_api_id_)["items"]
-    
-    for deployment in existing_deployments:
-        if "stageName" in deployment:
-            if deployment["stageName"] == stage_:
-                return True
 
-    return False
+    g_client.create_deployment(restApiId=rest_api_id_, stageName=stage_)
 
-def create_or_update_deployment(g_client, rest_api_id_, stage_):
+
+def configure_stage_cache(g_client, rest_api_id_, stage_, cache_):
     """
-    Create or update a deployment for an API Gateway.
+    Enable or disable response caching on an API Gateway stage.
+
+    Cached responses are served by API Gateway without invoking the Lambda function.
+    WARNING: the cache key does not include the request body: only enable it for endpoints
+    whose response is determined by the path, query string and cache key headers.
 
     Parameters:
     - g_client (boto3.client): AWS API Gateway client.
     - rest_api_id_ (str): The ID of the API Gateway REST API.
     - stage_ (str): The deployment stage name.
+    - cache_ (dict): Cache settings: 'enabled' (bool, default True), 'cluster_size' (str, GB) \
+        and 'ttl_seconds' (int).
     """
 
-    if check_stage_exists(g_client, rest_api_id_, stage_):
-        # Update the existing deployment
-        existing_deployments = g_client.get_deployments(restApiId=rest_api_id_)["items"]
-        
-        for deployment in existing_deployments:
-            if deployment["stageName"] == stage_:
-                g_client.update_deployment(
-                    restApiId=rest_api_id_,
-                    deploymentId=deployment["id"],
-                    stageName=stage_
-                )
-                return
-    else:
-        # If no existing deployment with the specified stage, create a new one
-        g_client.create_deployment(restApiId=rest_api_id_, stageName=stage_)
+    enabled = cache_.get("enabled", True)
+    cluster_size = cache_.get("cluster_size", GATEWAY_CACHE_CLUSTER_SIZE)
+    ttl_seconds = cache_.get("ttl_seconds", GATEWAY_CACHE_TTL_SECONDS)
 
+    patch_operations = [
+        {"op": "replace", "path": "/cacheClusterEnabled", "value": str(enabled).lower()},
+        {"op": "replace", "path": "/*/*/caching/enabled", "value": str(enabled).lower()},
+    ]
+
+    if enabled:
+        patch_operations += [
+            {"op": "replace", "path": "/cacheClusterSize", "value": str(cluster_size)},
+            {"op": "replace", "path": "/*/*/caching/ttlInSeconds", "value": str(ttl_seconds)},
+        ]
+
+    g_client.update_stage(
+        restApiId=rest_api_id_,
+        stageName=stage_,
+        patchOperations=patch_operations
+    )
 
 def create_api_key(g_client, rest_api_name_):
     """
@@ -336,15 +474,23 @@ def create_api_key(g_client, rest_api_name_):
     api_key_name = rest_api_name_ + "-key"
 
     # Check if an API key with the specified name already exists
-    existing_keys = g_client.get_api_keys(
+    # NOTE: nameQuery is a prefix filter, hence the exact name match on each page
+    paginator = g_client.get_paginator("get_api_keys")
+    pages = paginator.paginate(
         nameQuery=api_key_name,
-        includeValues=True
-    )["items"]
+        includeValues=True,
+        PaginationConfig={"PageSize": GATEWAY_PAGE_SIZE}
+    )
+
+    existing_key = next(
+        (key for page in pages for key in page["items"] if key["name"] == api_key_name),
+        None
+    )
+
+    if existing_key:
+        api_key_id = existing_key["id"]
+        api_key_value = existing_key["value"]
 
-    if existing_keys:
-        api_key_id = existing_keys[0]["id"] 
-        api_key_value = existing_keys[0]["value"]
-         
     else:
         # If no API key exists, create a new one
         response = g_client.create_api_key(
@@ -359,6 +505,35 @@ def create_api_key(g_client, rest_api_name_):
 
     return api_key_id, api_key_value
 
+def has_apigateway_permission(l_client, function_name_, source_arn_):
+    """
+    Check if API Gateway is already allowed to invoke a Lambda function from a given source.
+
+    Parameters:
+    - l_client (boto3.client): AWS Lambda client.
+    - function_name_ (str): The name of the Lambda function.
+    - source_arn_ (str): The Amazon Resource Name (ARN) of the API Gateway source.
+
+    Returns:
+    bool: True if the function policy already holds a statement for the source ARN, False otherwise.
+    """
+    try:
+        response = l_client.get_policy(FunctionName=function_name_)
+    except l_client.exceptions.ResourceNotFoundException:
+        # The function has no resource-based policy yet
+        return False
+
+    statements = loads(response["Policy"]).get("Statement", [])
+
+    for statement in statements:
+        condition = statement.get("Condition", {})
+        allowed_arn = condition.get("ArnLike", {}).get("AWS:SourceArn")
+
+        if allowed_arn == source_arn_:
+            return True
+
+    return False
+
 def add_apigateway_permission(l_client, function_name_, source_arn_):
     """
     Add an API Gateway permission to invoke a Lambda function.
@@ -382,18 +557,76 @@ def add_apigateway_permission(l_client, function_name_, source_arn_):
     except l_client.exceptions.ResourceConflictException:
         pass
 
-def create_usage_plan(g_client, rest_api_id_, api_key_id, stage_, usage_constraints_):
+def get_usage_plan_id_by_name(g_client, usage_plan_name, rest_api_id_, stage_):
     """
-    Create an API usage plan for API Gateway.
+    Get the ID of a usage plan by its name, bound to a given API stage.
+
+    Parameters:
+    - g_client (boto3.client): AWS API Gateway client.
+    - usage_plan_name (str): The name of the usage plan to search for.
+    - rest_api_id_ (str): The ID of the API Gateway REST API.
+    - stage_ (str): The deployment stage name.
+
+    Returns:
+    str: The ID of the usage plan if found, or None if not found.
+    """
+    paginator = g_client.get_paginator("get_usage_plans")
+    pages = paginator.paginate(PaginationConfig={"PageSize": GATEWAY_PAGE_SIZE})
+
+    for usage_plan in (item for page in pages for item in page["items"]):
+        if usage_plan["name"] != usage_plan_name:
+            continue
+
+        for api_stage in usage_plan.get("apiStages", []):
+            if api_stage.get("apiId") == rest_api_id_ and api_stage.get("stage") == stage_:
+                return usage_plan["id"]
+
+    return None
+
+def is_usage_plan_valid(g_client, usage_plan_id_, usage_plan_name, rest_api_id_, stage_):
+    """
+    Check if a usage plan ID still refers to a given usage plan, bound to a given API stage.
+
+    Parameters:
+    - g_client (boto3.client): AWS API Gateway client.
+    - usage_plan_id_ (str): The ID of the usage plan.
+    - usage_plan_name (str): The expected name of the usage plan.
+    - rest_api_id_ (str): The ID of the API Gateway REST API.
+    - stage_ (str): The deployment stage name.
+
+    Returns:
+    bool: True if the usage plan exists with this name and stage, False otherwise.
+    """
+
+    try:
+        usage_plan = g_client.get_usage_plan(usagePlanId=usage_plan_id_)
+    except g_client.exceptions.NotFoundException:
+        return False
+
+    if usage_plan["name"] != usage_plan_name:
+        return False
+
+    return any(
+        api_stage.get("apiId") == rest_api_id_ and api_stage.get("stage") == stage_
+        for api_stage in usage_plan.get("apiStages", [])
+    )
+
+def create_usage_plan(
+    g_client, rest_api_id_, api_key_id, stage_, usage_constraints_, usage_plan_id_=None
+):
+    """
+    Create an API usage plan for API Gateway, or reuse the existing one on redeploys.
 
     Parameters:
     - g_client (boto3.client): AWS API Gateway client.
     - rest_api_id_ (str): The ID of the API Gateway REST API.
     - stage_ (str): The deployment stage name.
     - usage_constraints_ (dict): Usage constraints, including rate limits and quotas.
+    - usage_plan_id_ (str, optional): The ID of the usage plan, if already known. Skips its lookup \
+        by name, unless the plan was deleted or rebound since.
 
     Returns:
-    str: The ID of the created API usage plan.
+    str: The ID of the created (or existing) API usage plan.
     """
 
     name=usage_constraints_["name"]
@@ -407,15 +640,36 @@ def create_usage_plan(g_client, rest_api_id_, api_key_id, stage_, usage_constrai
     rate_limits=usage_constraints_["rate_limits"]
     quota=usage_constraints_["quota"]
 
-    response = g_client.create_usage_plan(
-        name=name,
-        description=description,
-        apiStages=stages,
-        throttle=rate_limits,
-        quota=quota
-    )
+    # Reuse the usage plan of a previous deployment instead of piling up new ones
+    # NOTE: A known ID costs one O(1) lookup; the listing scan is only a fallback
+    if usage_plan_id_ and is_usage_plan_valid(g_client, usage_plan_id_, name, rest_api_id_, stage_):
+        usage_plan_id = usage_plan_id_
+    else:
+        usage_plan_id = get_usage_plan_id_by_name(g_client, name, rest_api_id_, stage_)
+
+    if not usage_plan_id:
+        response = g_client.create_usage_plan(
+            name=name,
+            description=description,
+            apiStages=stages,
+            throttle=rate_limits,
+            quota=quota
+        )
 
-    usage_plan_id = response["id"]
+        usage_plan_id = response["id"]
+    else:
+        # Keep the existing plan in sync with the current usage constraints
+        patch_operations = [
+            {"op": "replace", "path": "/throttle/burstLimit", "value": str(rate_limits["burstLimit"])},
+            {"op": "replace", "path": "/throttle/rateLimit", "value": str(rate_limits["rateLimit"])},
+            {"op": "replace", "path": "/quota/limit", "value": str(quota["limit"])},
+            {"op": "replace", "path": "/quota/period", "value": quota["period"]},
+        ]
+
+        g_client.update_usage_plan(
+            usagePlanId=usage_plan_id,
+            patchOperations=patch_operations
+        )
 
     try:
         g_client.create_usage_plan_key(
@@ -424,10 +678,9 @@ def create_usage_plan(g_client, rest_api_id_, api_key_id, stage_, usage_constrai
             keyType="API_KEY"
         )
     except ClientError as e:
-        error_code = e.response.get("Error", {}).get("Code")
-        if error_code == "ConflictException":
+        if get_error_code(e) == "ConflictException":
             # Handle the conflict (e.g., log it)
-            print(f"{str(e)}")
+            logger.info("%s", e)
         else:
             # Raise the exception for other errors
             raise e
@@ -462,17 +715,18 @@ def wait_for_api_endpoint(api_gateway_client, rest_api_id, stage_name):
     - stage_name (str): The name of the deployment stage.
 
     Note:
-    This function waits for the endpoint to become available and prints the URL when ready.
-    """
+    This function polls the stage with jittered exponential backoff and logs the URL when ready.
+    It is a public helper for callers that deploy stages by other means: `deploy_rest_api` does
+    not call it, since `create_or_update_deployment` only returns once the stage is deployed.
 
-    from time import sleep, time
-    start_time = time()
+    Raises:
+    TimeoutError: If the endpoint is not available after GATEWAY_DEPLOYMENT_TIME_OUT_SECONDS.
+    """
 
-    response = api_gateway_client.get_stage(
-        restApiId=rest_api_id, stageName=stage_name)
+    # Durations are measured on the monotonic clock, immune to wall-clock jumps
+    start_time = monotonic()
 
-    current_time = time()
-    def is_api_available(response):
+    def is_api_available(response, current_time):
         """
         Check if an API Gateway deployment is available based on its last update time.
 
@@ -481,6 +735,7 @@ def wait_for_api_endpoint(api_gateway_client, rest_api_id, stage_name):
 
         Parameters:
         - response (dict): API Gateway deployment response.
+        - current_time (float): The wall-clock time of the check, in seconds since the epoch.
 
         Returns:
         bool: True if the API Gateway deployment is available, False otherwise.
@@ -490,33 +745,54 @@ def wait_for_api_endpoint(api_gateway_client, rest_api_id, stage_name):
 
         return current_time - last_update_time <= GATEWAY_DEPLOYMENT_UPDATE_DELAY_SECONDS
 
-    while not is_api_available(response):
+    # NOTE: get_stage does not return the invoke URL, but it is fully determined locally
+    invoke_url = build_stage_url(rest_api_id, api_gateway_client.meta.region_name, stage_name)
+
+    def is_stage_ready():
+        """
+        Check once whether the stage is deployed and up to date.
+
+        Returns:
+        bool: True if the API Gateway endpoint is available, False otherwise.
+        """
+
         try:
             response = api_gateway_client.get_stage(
                 restApiId=rest_api_id, stageName=stage_name)
-            if is_api_available(response):
-                end_time = time()
-                duration = end_time - start_time
-
-                print(f"API Endpoint is available at: {response['invokeUrl']}")
-                print(
-                    f"API Endpoint deployment duration: {duration:.2f} seconds")
-                break
-            else:
-                print("API Endpoint deployment is still in progress. Waiting...")
+        except api_gateway_client.exceptions.NotFoundException:
+            logger.info("API Gateway stage not found. Waiting...")
+            return False
 
-                # Wait for 10 seconds before checking again
-                sleep(GATEWAY_DEPLOYMENT_SLEEP_SECONDS)
+        if not is_api_available(response, time()):
+            logger.info("API Endpoint deployment is still in progress. Waiting...")
+            return False
 
-        except api_gateway_client.exceptions.NotFoundException:
-            print("API Gateway stage not found. Waiting...")
+        return True
+
+    sleep_seconds = GATEWAY_DEPLOYMENT_SLEEP_SECONDS
+
+    # Redeploys of an existing stage are usually ready on the first check: no sleep at all then
+    while not is_stage_ready():
+        if monotonic() - start_time > GATEWAY_DEPLOYMENT_TIME_OUT_SECONDS:
+            raise TimeoutError("API Endpoint deployment timed out")
+
+        # Wait before checking again, backing off exponentially
+        # NOTE: The delays are jittered, so that concurrent deploys do not poll in lockstep
+        sleep(sleep_seconds)
+        sleep_seconds = min(
+            uniform(GATEWAY_DEPLOYMENT_SLEEP_SECONDS, 3 * sleep_seconds),
+            GATEWAY_DEPLOYMENT_MAX_SLEEP_SECONDS
+        )
+
+    duration = monotonic() - start_time
 
-            # Wait for 10 seconds before checking again
-            sleep(GATEWAY_DEPLOYMENT_SLEEP_SECONDS)
+    logger.info("API Endpoint is available at: %s", invoke_url)
+    logger.info("API Endpoint deployment duration: %.2f seconds", duration)
 
 def deploy_rest_api(g_client, account_id, region,
                     lambda_uri_, rest_api_name_, endpoint_, method_verb_,
-                    stage_, api_usage_constraints_):
+                    stage_, api_usage_constraints_, rest_api_id_=None,
+                    on_rest_api_id_=None, usage_plan_id_=None):
     """
     Deploy a REST API with AWS API Gateway.
 
@@ -529,49 +805,74 @@ def deploy_rest_api(g_client, account_id, region,
     - endpoint_ (str): The endpoint name.
     - method_verb_ (str): The HTTP method (HTTP verb) for the integration.
     - stage_ (str): The deployment stage of the API.
-    - api_usage_constraints_ (dict): Usage constraints, including rate limits and quotas.
+    - api_usage_constraints_ (dict): Usage constraints, including rate limits and quotas, \
+        and optionally the stage cache settings under 'cache' (see `configure_stage_cache`).
+    - rest_api_id_ (str, optional): The ID of the REST API, if already known. Skips its lookup by name, \
+        unless the API was deleted since.
+    - on_rest_api_id_ (callable, optional): Called with the REST API ID as soon as it is known, \
+        e.g. to start work that only needs the ID while steps 2 to 7 run.
+    - usage_plan_id_ (str, optional): The ID of the usage plan, if already known. Skips its lookup \
+        by name, unless the plan was deleted or rebound since.
 
     Returns:
-    dict: Information about the deployed API, including its URL, API key, usage plan ID, REST API ID, and ARN.
+    DeployedApi: Information about the deployed API, including its URL, API key, usage plan ID, REST API ID, and ARN.
     """
 
-    # 1.a. Check if the API already exists
-    rest_api_id = get_rest_api_id_by_name(g_client, rest_api_name_)
+    # NOTE: The API key (step 6) does not depend on the REST API: create it in background
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # 6. Create API key
+        api_key_future = executor.submit(create_api_key, g_client, rest_api_name_)
 
-    # 1.b. If the API doesn't exist, create it
-    if not rest_api_id:
-        rest_api_id = create_rest_api(g_client, rest_api_name_)
-    
-    # 2. Create or retrieve REST resource
-    resource_id = get_resource_id_by_name(g_client, rest_api_id, endpoint_)
-    if not resource_id:
-        # If the resource doesn't exist, create it
-        resource_id = create_endpoint_resource(g_client, rest_api_id, endpoint_)
+        # 1.a. Check if the API already exists
+        # NOTE: A known ID costs one O(1) lookup; the listing scan is only a fallback
+        if rest_api_id_ and rest_api_exists(g_client, rest_api_id_):
+            rest_api_id = rest_api_id_
+        else:
+            rest_api_id = get_rest_api_id_by_name(g_client, rest_api_name_)
+        root_id = None
 
-    # 3. Create REST method
-    create_rest_method(g_client, rest_api_id, resource_id, method_verb_)
+        # 1.b. If the API doesn't exist, create it
+        if not rest_api_id:
+            rest_api_id, root_id = create_rest_api(g_client, rest_api_name_)
 
-    # 4. Set up integration with the Lambda function
-    setup_integration(g_client, lambda_uri_, rest_api_id, resource_id, method_verb_)
-    
-    # 5. Create or update API stage
-    create_or_update_deployment(g_client, rest_api_id, stage_)
+        if on_rest_api_id_ is not None:
+            on_rest_api_id_(rest_api_id)
+
+        # 2. Create or retrieve REST resource
+        # NOTE: A freshly created API only holds its root resource, no need to look it up
+        resource_id = None if root_id else get_resource_id_by_name(g_client, rest_api_id, endpoint_)
+        if not resource_id:
+            # If the resource doesn't exist, create it
+            resource_id = create_endpoint_resource(g_client, rest_api_id, endpoint_, root_id)
 
-    # 6. Create API key
-    api_key_id, api_key_value = create_api_key(g_client, rest_api_name_)
+        # 3. Create REST method
+        create_rest_method(g_client, rest_api_id, resource_id, method_verb_)
+
+        # 4. Set up integration with the Lambda function
+        setup_integration(g_client, lambda_uri_, rest_api_id, resource_id, method_verb_)
+
+        # 5. Deploy the API to its stage
+        create_or_update_deployment(g_client, rest_api_id, stage_)
+
+        # 5.a. Configure the stage cache, only when the usage constraints ask for it
+        if "cache" in api_usage_constraints_:
+            configure_stage_cache(g_client, rest_api_id, stage_, api_usage_constraints_["cache"])
+
+        api_key_id, api_key_value = api_key_future.result()
 
     # 7. Create usage plan
     usage_plan_id = create_usage_plan(
-        g_client, rest_api_id, api_key_id, stage_, api_usage_constraints_)
+        g_client, rest_api_id, api_key_id, stage_, api_usage_constraints_,
+        usage_plan_id_=usage_plan_id_)
     
     # 8. Grant API Gateway permission to invoke the Lambda function
     this_api_arn = build_source_arn(region, account_id, rest_api_id)
 
-    return {
-        "url": build_api_url(rest_api_id, region, endpoint_, stage_),
-        "api_key": api_key_value,
-        "usage_plan_id": usage_plan_id,
-        "rest_api_id": rest_api_id,
-        "arn": this_api_arn
-    }
+    return DeployedApi(
+        url=build_api_url(rest_api_id, region, endpoint_, stage_),
+        api_key=api_key_value,
+        usage_plan_id=usage_plan_id,
+        rest_api_id=rest_api_id,
+        arn=this_api_arn
+    )
 
@@ -0,0 +1,78 @@
+from functools import lru_cache
+from threading import Lock
+
+from .default_values import CLIENT_MAX_POOL_CONNECTIONS, \
+    CLIENT_RETRY_MODE, CLIENT_MAX_ATTEMPTS
+
+# AWS clients created during this process, by service name and region
+CLIENTS_CACHE = {}
+
+# Serializes client creation: a boto3 Session is not thread-safe
+CLIENTS_LOCK = Lock()
+
+@lru_cache(maxsize=None)
+def get_client_config():
+    """
+    Get the configuration shared by every AWS client of the deployment pipeline.
+
+    Returns:
+    botocore.config.Config: The cached client configuration.
+    """
+
+    # NOTE: boto3/botocore are imported on first use to keep this module cheap to import
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=CLIENT_MAX_POOL_CONNECTIONS,
+        retries={"mode": CLIENT_RETRY_MODE, "max_attempts": CLIENT_MAX_ATTEMPTS},
+        tcp_keepalive=True,
+    )
+
+@lru_cache(maxsize=None)
+def get_session():
+    """
+    Get the boto3 session shared by the deployment pipeline.
+
+    The credential provider chain is walked eagerly here, once, so that every client
+    created from this session reuses the resolved credentials.
+
+    Returns:
+    boto3.session.Session: The cached session, resolving credentials only once.
+    """
+
+    from boto3.session import Session
+
+    session = Session()
+    session.get_credentials()
+
+    return session
+
+def get_client(service_name, region_):
+    """
+    Get an AWS client for a given service and region, created once and reused.
+
+    Clients are thread-safe once created, so threads share them; only their creation is serialized.
+
+    Parameters:
+    - service_name (str): The AWS service name (e.g. 'iam', 'lambda', 'apigateway').
+    - region_ (str): AWS region.
+
+    Returns:
+    boto3.client: The cached AWS client.
+    """
+
+    cache_key = (service_name, region_)
+    client = CLIENTS_CACHE.get(cache_key)
+
+    if client is None:
+        with CLIENTS_LOCK:
+            # Another thread may have created the client while this one waited
+            client = CLIENTS_CACHE.get(cache_key)
+
+            if client is None:
+                client = get_session().client(
+                    service_name, region_name=region_, config=get_client_config()
+                )
+                CLIENTS_CACHE[cache_key] = client
+
+    return client
@@ -1,23 +1,64 @@
 # Sleep interval in seconds between checks while waiting for Lambda deployment.
-LAMBDA_SLEEP_SECONDS = 5
+LAMBDA_SLEEP_SECONDS = 2
 
 # Timeout duration in seconds for waiting for Lambda deployment.
 LAMBDA_UPDATE_TIME_OUT_SECONDS = 600
 
-# Sleep interval in seconds between checks while waiting for Gateway deployment.
-GATEWAY_DEPLOYMENT_SLEEP_SECONDS = 1
+# Initial sleep interval in seconds between checks while waiting for Gateway deployment.
+# NOTE: Each next interval is drawn uniformly between this value and 3 times the previous
+# interval (jittered backoff), capped at GATEWAY_DEPLOYMENT_MAX_SLEEP_SECONDS.
+GATEWAY_DEPLOYMENT_SLEEP_SECONDS = 0.5
+
+# Maximum sleep interval in seconds between checks while waiting for Gateway deployment.
+GATEWAY_DEPLOYMENT_MAX_SLEEP_SECONDS = 5
+
+# Timeout duration in seconds for waiting for Gateway deployment.
+GATEWAY_DEPLOYMENT_TIME_OUT_SECONDS = 600
 
 # Delay in seconds before checking Gateway deployment status.
 GATEWAY_DEPLOYMENT_UPDATE_DELAY_SECONDS = 600
 
+# Default size in GB of the stage cache cluster, when the usage constraints enable caching.
+GATEWAY_CACHE_CLUSTER_SIZE = "0.5"
+
+# Default time to live in seconds of cached responses, when the usage constraints enable caching.
+GATEWAY_CACHE_TTL_SECONDS = 300
+
 # The default tag for AWS resources.
 DEFAULT_TAG = "latest"
 
+# Prefix of the ECR image tag recording the digest of the Docker build context.
+ECR_CONTEXT_TAG_PREFIX = "context-"
+
+# Time in seconds during which a Docker login to ECR is reused (ECR tokens last 12 hours).
+ECR_LOGIN_TTL_SECONDS = 11 * 60 * 60
+
+# Number of last output lines of a failed streamed command logged as errors.
+COMMAND_ERROR_TAIL_LINES = 20
+
 # The ARN (Amazon Resource Name) for the AWS Lambda execution role.
 LAMBDA_POLICY_ARN = "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
 
+# Maximum number of pooled connections kept by each AWS client.
+CLIENT_MAX_POOL_CONNECTIONS = 50
+
+# Retry strategy used by AWS clients to absorb throttling.
+CLIENT_RETRY_MODE = "adaptive"
+
+# Maximum number of retries (on top of the first call) per AWS request.
+CLIENT_MAX_ATTEMPTS = 10
 
+# The file where the deployment state is persisted between runs.
+DEPLOYMENT_STATE_PATH = "~/.lambda-api/state.json"
 
+# Time in seconds during which a persisted deployment state is reused (its REST API ID is still checked).
+DEPLOYMENT_STATE_TTL_SECONDS = 86400
 
+# Number of items requested per page on API Gateway list calls (maximum allowed is 500).
+GATEWAY_PAGE_SIZE = 500
 
+# Maximum number of REST APIs deleted concurrently (DeleteRestApi is heavily throttled by AWS).
+GATEWAY_DELETE_MAX_WORKERS = 4
 
+# Time in seconds during which a listing of the REST APIs of an account is reused.
+GATEWAY_LISTING_TTL_SECONDS = 30
@@ -1,5 +1,24 @@
-from .default_values import DEFAULT_TAG
-
+from base64 import b64decode
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import sha256
+from json import load, JSONDecodeError
+import logging
+from os import environ, walk, path as os_path
+import subprocess
+
+from .clients import get_client
+from .default_values import DEFAULT_TAG, ECR_CONTEXT_TAG_PREFIX, ECR_LOGIN_TTL_SECONDS, \
+    COMMAND_ERROR_TAIL_LINES
+from .state_utils import get_deployment_state, save_deployment_state
+
+logger = logging.getLogger(__name__)
+
+# ECR repositories known to exist during this process, by region and repository name
+ECR_REPOSITORIES_CACHE = set()
+
+@lru_cache(maxsize=256)
 def build_tagged_image(image_name, tag):
     """
     Build a tagged Docker image name.
@@ -15,6 +34,7 @@ def build_tagged_image(image_name, tag):
     return f"{image_name}:{tag}"
 
 
+@lru_cache(maxsize=256)
 def build_ecr_password_stdin(account_id_, region_):
     """
     Build the password standard input for AWS ECR.
@@ -30,6 +50,7 @@ def build_ecr_password_stdin(account_id_, region_):
     return f"{account_id_}.dkr.ecr.{region_}.amazonaws.com"
 
 
+@lru_cache(maxsize=256)
 def build_ecr_url(account_id_, region_, image_name, tag_=DEFAULT_TAG):
     """
     Build the ECR URL for a Docker image.
@@ -50,31 +71,104 @@ def build_ecr_url(account_id_, region_, image_name, tag_=DEFAULT_TAG):
     return f"{password_stdin}/{tagged_image_name}"
 
 
-def run(command):
+def run(command, input_=None, env_=None):
     """
-    Run a shell command.
+    Run a command, without going through a shell, discarding its standard output.
+
+    The standard output (e.g. push progress) is never buffered; errors still reach the console.
 
     Parameters:
-    command (str): The shell command to run.
-    verbose (bool, optional): If True, run the command in verbose mode (default is False).
+    command (list of str): The command to run, as its argument list.
+    input_ (str, optional): Text sent to the standard input of the command (default is None).
+    env_ (dict, optional): Environment variables added to the current ones (default is None).
+    
+    Returns:
+    int: The return code of the command.
+    """
+
+    try:
+        result = subprocess.run(
+            command,
+            stdout=subprocess.DEVNULL,
+            shell=False,
+            text=True,
+            input=input_,
+            env={**environ, **env_} if env_ else None
+        )
+
+        return result.returncode
+
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+        return 1
+
+def run_stream(command, env_=None):
+    """
+    Run a command, without going through a shell, logging its output line by line.
+
+    Progress shows up while the command runs. Lines are logged at INFO; on a non-zero exit,
+    the last COMMAND_ERROR_TAIL_LINES lines (where the error is) are logged again at ERROR.
+
+    Parameters:
+    command (list of str): The command to run, as its argument list.
+    env_ (dict, optional): Environment variables added to the current ones (default is None).
+
+    Returns:
+    int: The return code of the command.
+    """
+
+    try:
+        # Only the tail of the output is kept in memory, for error reports
+        tail = deque(maxlen=COMMAND_ERROR_TAIL_LINES)
+
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            shell=False,
+            text=True,
+            bufsize=1,
+            env={**environ, **env_} if env_ else None
+        ) as process:
+            for line in process.stdout:
+                tail.append(line.rstrip())
+                logger.info("%s", tail[-1])
+
+        if process.returncode != 0:
+            logger.error(
+                "Command %s exited with code %s:\n%s",
+                command[:2], process.returncode, "\n".join(tail)
+            )
+
+        return process.returncode
+
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+        return 1
+
+def run_capture(command):
+    """
+    Run a command, without going through a shell, capturing its outputs.
+
+    Parameters:
+    command (list of str): The command to run, as its argument list.
     
     Returns:
     dict: A dictionary containing 'stdout' and 'stderr' keys with the respective outputs.
     """
-    import subprocess
 
     try:
         result = subprocess.run(
             command, 
-            stdout=subprocess.PIPE, 
+            stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            shell=True,
+            shell=False,
             text=True
         )
 
         output = {
-            "stdout": str(result.stdout).strip() ,
-            "stderr": str(result.stdout).strip(),
+            "stdout": result.stdout.strip(),
+            "stderr": result.stderr.strip(),
             "returncode": result.returncode
         }
 
@@ -84,106 +178,227 @@ def run(command):
         print(f"An error occurred: {str(e)}")
         return {"stdout": "", "stderr": str(e), "returncode": 1}
 
+def has_docker_auth(registry_):
+    """
+    Check if the Docker client configuration holds credentials for a registry.
+
+    Parameters:
+    registry_ (str): The registry host.
+
+    Returns:
+    bool: True if the registry has an entry in the Docker configuration, False otherwise.
+    """
+
+    docker_folder = environ.get("DOCKER_CONFIG", os_path.expanduser("~/.docker"))
+
+    try:
+        with open(os_path.join(docker_folder, "config.json"), "r") as config_file:
+            return registry_ in load(config_file).get("auths", {})
+    except (OSError, JSONDecodeError):
+        return False
+
 def login_ecr_docker(account_id, region):
     """
-    Log in to AWS ECR for Docker image uploads.
+    Log in to AWS ECR for Docker image uploads, unless a recent login is still valid.
 
     Parameters:
     account_id (str): AWS account ID.
     region (str): AWS region.
     """
 
-    print("Logging in on ECR account...")
-
     password_stdin = build_ecr_password_stdin(account_id, region)
 
-    opts = f"get-login-password --region {region}"
-    get_pwd_command = f"aws ecr {opts}"
+    # ECR tokens last 12 hours: a recent login of this machine is reused
+    state_key = f"ecr-login/{password_stdin}"
+
+    if get_deployment_state(state_key, ECR_LOGIN_TTL_SECONDS) and has_docker_auth(password_stdin):
+        print("Reusing ECR login...")
+        return
+
+    print("Logging in on ECR account...")
+
+    # The authorization token is fetched in-process, no `aws` CLI involved
+    response = get_client("ecr", region).get_authorization_token()
+    token = response["authorizationData"][0]["authorizationToken"]
 
-    opts = f"--username AWS --password-stdin {password_stdin}"
-    login_command = f"docker login {opts}"
+    # The token is the base64 encoding of 'AWS:<password>'
+    password = b64decode(token).decode().split(":", 1)[1]
 
-    entry_command = f"{get_pwd_command} | {login_command}"
+    opts = ["--username", "AWS", "--password-stdin", password_stdin]
+    login_command = ["docker", "login", *opts]
 
-    run(entry_command)
+    if run(login_command, input_=password) == 0:
+        save_deployment_state(state_key, {"registry": password_stdin})
 
 
-def create_ecr_image(ecr_image_name_):
+def create_ecr_image(region_, ecr_image_name_):
     """
     Create an AWS ECR repository for a Docker image.
 
     Parameters:
+    region_ (str): AWS region.
     ecr_image_name_ (str): The name of the ECR repository.
     """
 
     print("Creating ECR image...")
 
-    args_1 = f"--repository-name {ecr_image_name_}"
-    args_2 = "--image-scanning-configuration scanOnPush=true"
-    args_3 = "--image-tag-mutability MUTABLE"
-    create_args = f"{args_1} {args_2} {args_3}"
-
-    opts = f"create-repository {create_args}"
-    create_comand = f"aws ecr {opts}"
+    get_client("ecr", region_).create_repository(
+        repositoryName=ecr_image_name_,
+        imageScanningConfiguration={"scanOnPush": True},
+        imageTagMutability="MUTABLE"
+    )
 
-    run(create_comand)
+    ECR_REPOSITORIES_CACHE.add((region_, ecr_image_name_))
 
 def does_ecr_image_exist(region, ecr_image_name):
-    from json import loads
-    
+    """
+    Check if an AWS ECR repository exists.
+
+    Parameters:
+    region (str): AWS region.
+    ecr_image_name (str): The name of the ECR repository.
+
+    Returns:
+    bool: True if the repository exists, False otherwise.
+    """
+
+    # A repository seen once is assumed to stay: skip the lookup
+    # NOTE: Callers discard the entry when ECR reports the repository missing
+    if (region, ecr_image_name) in ECR_REPOSITORIES_CACHE:
+        return True
+
+    ecr_client = get_client("ecr", region)
+
+    # The call fails on a missing repository, so its success is the answer
     try:
-        base_command="aws ecr"
-        statement="describe-repositories"
-        args=f"--repository-names {ecr_image_name} --region {region}"
-        command = f"{base_command} {statement} {args}"
-        result = run(command)
-        
-        if result["returncode"] == 0:
-            response_json = loads(result["stdout"])
-            
-            repositories = response_json.get("repositories", [])
-            
-            def is_repository(repository):
-                return repository.get("repositoryName", None) == ecr_image_name
-            this_repository=list(filter(is_repository, repositories))
-            
-            return len(this_repository) == 1
-        else:
-            return False
+        ecr_client.describe_repositories(repositoryNames=[ecr_image_name])
+    except ecr_client.exceptions.RepositoryNotFoundException:
+        return False
     except Exception as e:
         print(f"An error occurred: {str(e)}")
         return False
 
+    ECR_REPOSITORIES_CACHE.add((region, ecr_image_name))
+
+    return True
+
 def delete_ecr_image(region_, ecr_image_name_):
     """
     Delete an existing AWS ECR repository for a Docker image.
 
     Parameters:
+    region_ (str): AWS region.
     ecr_image_name_ (str): The name of the ECR repository.
     """
 
     print("Deleting existent ECR image...")
 
-    tags = f"--force --repository-name {ecr_image_name_} --region {region_}"
-    delete_command = f"aws ecr delete-repository {tags}"
-    
-    run(delete_command)
+    ECR_REPOSITORIES_CACHE.discard((region_, ecr_image_name_))
 
+    get_client("ecr", region_).delete_repository(
+        repositoryName=ecr_image_name_, force=True
+    )
 
-def build_docker_image(ecr_image_name):
+
+def build_context_tag(context_path_="."):
+    """
+    Build an image tag from the digest of a Docker build context.
+
+    Parameters:
+    context_path_ (str, optional): The folder of the build context (default is '.').
+
+    Returns:
+    str: The image tag, identical for identical build contexts, or an empty string \
+        if some file of the context cannot be read (the image is then always rebuilt).
+    """
+
+    digest = sha256()
+
+    try:
+        for folder, subfolders, file_names in walk(context_path_):
+            # Walk the context in a stable order, so that the digest only depends on its content
+            subfolders.sort()
+
+            for file_name in sorted(file_names):
+                file_path = os_path.join(folder, file_name)
+
+                # Delimit each file by its path and size, so that no two contexts collide
+                relative_path = os_path.relpath(file_path, context_path_)
+                digest.update(f"{relative_path}\0{os_path.getsize(file_path)}\0".encode())
+
+                with open(file_path, "rb") as file:
+                    for chunk in iter(lambda: file.read(1 << 16), b""):
+                        digest.update(chunk)
+
+    # NOTE: e.g. a dangling symlink or an unreadable file must not abort the deploy
+    except OSError as error:
+        logger.warning("Build context cannot be hashed, the image will be rebuilt: %s", error)
+        return ""
+
+    return f"{ECR_CONTEXT_TAG_PREFIX}{digest.hexdigest()}"
+
+def is_ecr_image_up_to_date(region_, ecr_image_name_, tag_, context_tag_):
+    """
+    Check if the ECR image of a tag was built from a given build context.
+
+    Parameters:
+    region_ (str): AWS region.
+    ecr_image_name_ (str): The name of the ECR repository.
+    tag_ (str): The Docker image tag.
+    context_tag_ (str): The build context tag (see `build_context_tag`).
+
+    Returns:
+    bool: True if the image of the tag also carries the build context tag, False otherwise.
+    """
+
+    ecr_client = get_client("ecr", region_)
+
+    try:
+        response = ecr_client.describe_images(
+            repositoryName=ecr_image_name_,
+            imageIds=[{"imageTag": tag_}]
+        )
+    except ecr_client.exceptions.ImageNotFoundException:
+        return False
+    except ecr_client.exceptions.RepositoryNotFoundException:
+        # Deleted outside this process: forget it, so that it is created again before the push
+        ECR_REPOSITORIES_CACHE.discard((region_, ecr_image_name_))
+        return False
+
+    return any(
+        context_tag_ in image.get("imageTags", [])
+        for image in response["imageDetails"]
+    )
+
+def build_docker_image(ecr_image_name, cache_from_=None, tags_=None):
     """
     Build a Docker image from a Dockerfile.
 
     Parameters:
     ecr_image_name (str): The name of the Docker image.
+    cache_from_ (str, optional): An image whose layers are reused as build cache (default is None).
+    tags_ (list of str, optional): Further names given to the image (default is None). \
+        Tagging at build time spares a later `docker tag` call per name.
+
+    Returns:
+    int: The return code of the build.
     """
 
     print("Building docker image...")
 
-    build_args = f"-q -t {ecr_image_name} ."
-    build_command = f"docker build {build_args}"
+    # NOTE: No '-q': the build progress is streamed to the logger
+    build_args = ["-t", ecr_image_name]
+
+    for tag in tags_ or []:
+        build_args += ["-t", tag]
+
+    if cache_from_:
+        # BuildKit fetches the cache metadata of the image from the registry, no pull needed
+        build_args += ["--build-arg", "BUILDKIT_INLINE_CACHE=1", "--cache-from", cache_from_]
+
+    build_command = ["docker", "build", *build_args, "."]
 
-    run(build_command)
+    return run_stream(build_command, env_={"DOCKER_BUILDKIT": "1"})
 
 
 def tag_docker_image(tagged_image_uri_, routed_url):
@@ -197,8 +412,8 @@ def tag_docker_image(tagged_image_uri_, routed_url):
 
     print("Tagging docker image...")
 
-    tag_args = f"{tagged_image_uri_} {routed_url}"
-    tag_command = f"docker tag {tag_args}"
+    tag_args = [tagged_image_uri_, routed_url]
+    tag_command = ["docker", "tag", *tag_args]
 
     run(tag_command)
 
@@ -209,26 +424,49 @@ def push_docker_image(tagged_image_uri):
 
     Parameters:
     tagged_image_uri (str): The tagged Docker image URI.
+
+    Returns:
+    int: The return code of the push.
     """
 
     print("Pushing docker image to ECR...")
     
-    push_command = f"docker push {tagged_image_uri}"
+    push_command = ["docker", "push", tagged_image_uri]
 
-    run(push_command)
+    return run_stream(push_command)
 
-def clear_images(ecr_image_name):
-    list_images="docker images"
-    grep_images=f"grep {ecr_image_name}"
-    get_images_ids="awk '{ print $3 }'"
-    rmi_images="xargs docker rmi"
-    
-    clear_command=f"{list_images} | {grep_images} | {get_images_ids} | {rmi_images}"
+def clear_images(ecr_image_name, registry_=None):
+    """
+    Remove the local Docker images of a repository.
+
+    Parameters:
+    ecr_image_name (str): The name of the Docker image.
+    registry_ (str, optional): The registry host the image is also named after (default is None).
+    """
+
+    list_command = ["docker", "images", "--format", "{{.ID}} {{.Repository}}"]
+    listing = run_capture(list_command)["stdout"]
+
+    # NOTE: Names must match exactly: 'model' must not remove the images of 'model-v2'
+    repositories = {ecr_image_name}
+
+    if registry_:
+        repositories.add(f"{registry_}/{ecr_image_name}")
+
+    # Filter the listing in Python instead of piping it through grep and awk
+    image_ids = []
 
-    run(clear_command)
+    for line in listing.splitlines():
+        image_id, repository = line.split(" ", 1)
+
+        if repository in repositories and image_id not in image_ids:
+            image_ids.append(image_id)
+
+    if image_ids:
+        run(["docker", "rmi", *image_ids])
 
 def pipe_docker_image_to_ecr(
-    account_id_, region_, ecr_image_name_, tag_=DEFAULT_TAG
+    account_id_, region_, ecr_image_name_, tag_=DEFAULT_TAG, context_tag_=None
 ):
     """
     Upload a Docker image to AWS ECR.
@@ -238,30 +476,66 @@ def pipe_docker_image_to_ecr(
     region_ (str): AWS region.
     ecr_image_name_ (str): The name of the ECR repository.
     tag_ (str, optional): The Docker image tag (default is 'latest').
+    context_tag_ (str, optional): The build context tag, if already computed for this \
+        deployment (see `build_context_tag`). If None (default), it is computed here.
     """
 
-    # 1. Log in to AWS ECR
-    login_ecr_docker(account_id_, region_)
-    
-    # 2. Check if the ECR repo already exists, delete it and create anew
-    if does_ecr_image_exist(region_, ecr_image_name_):
-        delete_ecr_image(region_, ecr_image_name_)
+    routed_url = build_ecr_url(account_id_, region_, ecr_image_name_, tag_)
 
-    # 3. Create new image
-    create_ecr_image(ecr_image_name_)
+    # 1. Skip the build and push when ECR already holds an image of the same build context
+    context_tag = build_context_tag() if context_tag_ is None else context_tag_
 
-    # 4. Build Docker image using your local Dockerfile
-    build_docker_image(ecr_image_name_)
+    if context_tag and is_ecr_image_up_to_date(region_, ecr_image_name_, tag_, context_tag):
+        print("ECR image is up to date, skipping build and push...")
+        return routed_url
 
-    # 5. Tag you image
-    tagged_image_uri = build_tagged_image(ecr_image_name_, tag_)
-    routed_url = build_ecr_url(account_id_, region_, ecr_image_name_, tag_)
-    tag_docker_image(tagged_image_uri, routed_url)
+    # NOTE: Without a context tag, the image is only pushed under the requested tag
+    image_urls = [routed_url]
+
+    if context_tag:
+        image_urls.append(build_ecr_url(account_id_, region_, ecr_image_name_, context_tag))
+
+    def ensure_ecr_image():
+        # 3. Create the ECR repo, unless it already exists
+        # NOTE: The repository is kept between deploys, so that ECR reuses the pushed layers
+        if not does_ecr_image_exist(region_, ecr_image_name_):
+            create_ecr_image(region_, ecr_image_name_)
+
+    # NOTE: Only the push needs the repository: prepare it while the image builds
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        repository_future = executor.submit(ensure_ecr_image)
+
+        # 2. Log in to AWS ECR (the build reads its layer cache from ECR)
+        login_ecr_docker(account_id_, region_)
+
+        # 4. Build Docker image using your local Dockerfile, reusing the layers of the last push
+        # NOTE: The image is tagged here with the requested tag and the build context tag
+        build_code = build_docker_image(
+            ecr_image_name_, cache_from_=routed_url, tags_=image_urls
+        )
+
+        repository_future.result()
+
+    if build_code != 0:
+        raise RuntimeError(f"Docker build of {ecr_image_name_} failed with code {build_code}")
+
+    # 5. Push your image to ECR
+    # NOTE: The context tag goes last: it marks the requested tag as up to date
+    for url in image_urls:
+        push_code = push_docker_image(url)
+
+        # The repository may have been deleted meanwhile: check it again, and retry once if so
+        if push_code != 0:
+            ECR_REPOSITORIES_CACHE.discard((region_, ecr_image_name_))
+
+            if not does_ecr_image_exist(region_, ecr_image_name_):
+                create_ecr_image(region_, ecr_image_name_)
+                push_code = push_docker_image(url)
 
-    # 6. Push your image to ECR
-    push_docker_image(routed_url)
+        if push_code != 0:
+            raise RuntimeError(f"Docker push of {url} failed with code {push_code}")
 
-    # 7. Clear local images based on ecr image name
-    clear_images(ecr_image_name_)
+    # 6. Clear local images based on ecr image name
+    clear_images(ecr_image_name_, build_ecr_password_stdin(account_id_, region_))
 
     return routed_url
@@ -16,20 +16,41 @@ def try_get_role(i_client, role_name_, trust_policy):
     Returns:
     dict: Information about the IAM role.
     """
-    
 
     try:
         return i_client.get_role(
             RoleName=role_name_
         )
     except i_client.exceptions.NoSuchEntityException:
-        i_client.create_role(
+        return i_client.create_role(
             RoleName=role_name_,
             AssumeRolePolicyDocument=dumps(trust_policy),
             Description="Execution role for Lambda function",
         )
 
 
+def has_role_policy(i_client, role_name_, policy_arn_):
+    """
+    Check if a managed policy is attached to an AWS IAM role.
+
+    Parameters:
+    - i_client (boto3.client): AWS IAM client.
+    - role_name_ (str): The name of the IAM role.
+    - policy_arn_ (str): The ARN (Amazon Resource Name) of the managed policy.
+
+    Returns:
+    bool: True if the policy is attached to the role, False otherwise.
+    """
+
+    paginator = i_client.get_paginator("list_attached_role_policies")
+
+    return any(
+        policy["PolicyArn"] == policy_arn_
+        for page in paginator.paginate(RoleName=role_name_)
+        for policy in page["AttachedPolicies"]
+    )
+
+
 def try_attach_role_policy(i_client, role_name_, trust_policy):
     """
     Try to attach an AWS managed policy to an existing IAM role. If the role does not exist, create it first.
@@ -46,12 +67,18 @@ def try_attach_role_policy(i_client, role_name_, trust_policy):
     # Just need to run it once, otherwise retrieve already existing role
     response = try_get_role(i_client, role_name_, trust_policy)
 
+    # The error was already reported by `handle_aws_errors`
+    if response is None:
+        return None
+
     # Get the role ARN
     role_arn = response["Role"]["Arn"]
 
-    # Attach the AWSLambdaBasicExecutionRole policy to the role
-    i_client.attach_role_policy(
-        RoleName=role_name_,
-        PolicyArn=LAMBDA_POLICY_ARN)
+    # Attach the AWSLambdaBasicExecutionRole policy to the role, unless already attached
+    # NOTE: IAM reads are cheaper and less throttled than writes on redeploys
+    if not has_role_policy(i_client, role_name_, LAMBDA_POLICY_ARN):
+        i_client.attach_role_policy(
+            RoleName=role_name_,
+            PolicyArn=LAMBDA_POLICY_ARN)
 
     return role_arn
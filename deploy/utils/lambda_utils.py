@@ -1,6 +1,38 @@
+from functools import lru_cache
+from math import ceil
+from time import monotonic
+
+from botocore.exceptions import WaiterError
+
 from .misc import handle_aws_errors
 from .default_values import LAMBDA_SLEEP_SECONDS, LAMBDA_UPDATE_TIME_OUT_SECONDS
 
+# Lambda functions known to exist during this process, by region and function name
+LAMBDA_FUNCTIONS_CACHE = set()
+
+# Static parts of the Lambda integration URI, resolved once at import time
+LAMBDA_URI_PREFIX = "arn:aws:apigateway:"
+LAMBDA_URI_INFIX = ":lambda:path/2015-03-31/functions/"
+LAMBDA_URI_SUFFIX = "/invocations"
+
+@lru_cache(maxsize=256)
+def build_lambda_arn(region_, account_id_, function_name_):
+    """
+    Build the ARN (Amazon Resource Name) of a Lambda function.
+
+    Parameters:
+    region_ (str): The AWS region.
+    account_id_ (str): The AWS account ID.
+    function_name_ (str): The name of the Lambda function.
+
+    Returns:
+    str: The Lambda function ARN.
+    """
+
+    return f"arn:aws:lambda:{region_}:{account_id_}:function:{function_name_}"
+
+
+@lru_cache(maxsize=256)
 def build_lambda_uri(region_, lambda_arn_):
     """
     Build a Lambda URI using the Lambda ARN.
@@ -13,9 +45,7 @@ def build_lambda_uri(region_, lambda_arn_):
     str: The Lambda URI.
     """
 
-    uri_host = f"arn:aws:apigateway:{region_}:lambda:path"
-    uri_route = f"2015-03-31/functions/{lambda_arn_}/invocations"
-    return f"{uri_host}/{uri_route}"
+    return "".join((LAMBDA_URI_PREFIX, region_, LAMBDA_URI_INFIX, lambda_arn_, LAMBDA_URI_SUFFIX))
 
 
 def get_lambda_function_name(ecr_image_name: str):
@@ -116,6 +146,8 @@ def delete_lambda_function(l_client, function_name):
 
     :param function_name: The name of the function to delete.
     """
+    LAMBDA_FUNCTIONS_CACHE.discard((l_client.meta.region_name, function_name))
+
     try:
         return l_client.delete_function(FunctionName=function_name)
     except l_client.exceptions.ClientError:
@@ -123,41 +155,37 @@ def delete_lambda_function(l_client, function_name):
 
 
 @handle_aws_errors
-def wait_for_lambda_deployment(lambda_client, lambda_function_name):
+def wait_for_lambda_deployment(lambda_client, lambda_function_name, waiter_name_="function_active_v2"):
     """
     Wait for the deployment of a Lambda function.
 
     Parameters:
     lambda_client (boto3.client): AWS Lambda client.
     lambda_function_name (str): The name of the Lambda function.
-    """
-
-    from time import time, sleep
+    waiter_name_ (str, optional): The Lambda waiter to use: 'function_active_v2' (default) after \
+        a creation, 'function_updated_v2' after a code update.
 
-    start_time = time()
-
-    response_get = get_lambda_function(lambda_client, lambda_function_name)
+    Raises:
+    TimeoutError: If the deployment is not done after LAMBDA_UPDATE_TIME_OUT_SECONDS.
+    """
 
-    def is_creation_pending(response):
-        return response["Configuration"]["State"] == "Pending"
+    start_time = monotonic()
 
-    while is_creation_pending(response_get):
-        try:
-            response_get = get_lambda_function(
-                lambda_client, lambda_function_name)
-        except ValueError as msg:
-            print(str(msg))
+    print("Lambda deployment is in progress. Waiting...")
 
-        current_time = time()
-        deployment_duration = current_time - start_time
+    # The waiter polls GetFunction until the function state (or last update status) settles
+    waiter = lambda_client.get_waiter(waiter_name_)
+    waiter_config = {
+        "Delay": LAMBDA_SLEEP_SECONDS,
+        "MaxAttempts": ceil(LAMBDA_UPDATE_TIME_OUT_SECONDS / LAMBDA_SLEEP_SECONDS),
+    }
 
-        if deployment_duration > LAMBDA_UPDATE_TIME_OUT_SECONDS:
-            raise TimeoutError("Lambda deployment timed out")
-
-        print("Lambda deployment is still in progress. Waiting...")
+    try:
+        waiter.wait(FunctionName=lambda_function_name, WaiterConfig=waiter_config)
+    except WaiterError as error:
+        raise TimeoutError(f"Lambda deployment timed out: {error}") from error
 
-        # Wait before checking again
-        sleep(LAMBDA_SLEEP_SECONDS)
+    deployment_duration = monotonic() - start_time
 
     duration_seconds=f"{deployment_duration:.2f} seconds"
     lambda_deploy_message=f"Lambda function deployment duration: {duration_seconds}"
@@ -172,9 +200,8 @@ def deploy_lambda_function(
 
     Parameters:
     lambda_client (boto3.client): AWS Lambda client.
-    func_description (str): The description of the Lambda function.
-    aws_account_id (str): The AWS account ID.
-    aws_region (str): The AWS region.
+    lambda_function_name (str): The name of the Lambda function.
+    lambda_function_description (str): The description of the Lambda function.
     routed_ecr_url (str): The uri of the ECR image.
     role_arn (str): The ARN of the IAM role associated with the Lambda function.
     """
@@ -188,6 +215,8 @@ def deploy_lambda_function(
 
     wait_for_lambda_deployment(lambda_client, lambda_function_name)
 
+    LAMBDA_FUNCTIONS_CACHE.add((lambda_client.meta.region_name, lambda_function_name))
+
 
 def lambda_exists(lambda_client, lambda_function_name):
     """
@@ -200,12 +229,22 @@ def lambda_exists(lambda_client, lambda_function_name):
     Returns:
     bool: True if the Lambda function exists, False otherwise.
     """
+    cache_key = (lambda_client.meta.region_name, lambda_function_name)
+
+    # A function seen once is assumed to stay: skip the lookup
+    # NOTE: update_or_deploy_lambda_function discards the entry when the update finds none
+    if cache_key in LAMBDA_FUNCTIONS_CACHE:
+        return True
+
     try:
         lambda_client.get_function(FunctionName=lambda_function_name)
-        return True
     except lambda_client.exceptions.ResourceNotFoundException:
         return False
 
+    LAMBDA_FUNCTIONS_CACHE.add(cache_key)
+
+    return True
+
 
 def update_lambda_function_code(
     lambda_client, lambda_function_name, routed_ecr_url
@@ -229,6 +268,9 @@ def update_lambda_function_code(
         ImageUri=routed_ecr_url
     )
 
+    # NOTE: Updates are asynchronous, and a new update is rejected while one is in progress
+    wait_for_lambda_deployment(lambda_client, lambda_function_name, "function_updated_v2")
+
 
 def update_or_deploy_lambda_function(\
         lambda_client, \
@@ -255,10 +297,15 @@ def update_or_deploy_lambda_function(\
     """
 
     if lambda_exists(lambda_client, lambda_function_name):
-        # Update the Lambda function code
-        update_lambda_function_code(lambda_client, lambda_function_name, ecr_image_url)
-    else:
-        # Deploy a new Lambda function with the ECR image
-        deploy_lambda_function(
-            lambda_client, lambda_function_name, lambda_function_description, ecr_image_url, role_arn
-        )
+        try:
+            # Update the Lambda function code
+            update_lambda_function_code(lambda_client, lambda_function_name, ecr_image_url)
+            return
+        except lambda_client.exceptions.ResourceNotFoundException:
+            # Deleted outside this process: forget it, and create it again below
+            LAMBDA_FUNCTIONS_CACHE.discard((lambda_client.meta.region_name, lambda_function_name))
+
+    # Deploy a new Lambda function with the ECR image
+    deploy_lambda_function(
+        lambda_client, lambda_function_name, lambda_function_description, ecr_image_url, role_arn
+    )
@@ -1,6 +1,19 @@
+from copy import deepcopy
+from functools import lru_cache, wraps
 from json import load, JSONDecodeError
+import logging
+from os import getenv, path as os_path
+from time import perf_counter_ns
 from botocore.exceptions import ClientError, BotoCoreError
 
+logger = logging.getLogger(__name__)
+
+# Folder of this module, resolved once at import time
+MODULE_FOLDER = os_path.dirname(os_path.abspath(__file__))
+
+# Set LAMBDA_API_TIMING=0 to turn the `timing` decorator into a no-op
+TIMING_ENABLED = getenv("LAMBDA_API_TIMING", "1") != "0"
+
 def load_JSON(json_file_path_):
     """
     Load JSON data from a file.
@@ -21,8 +34,7 @@ def load_JSON(json_file_path_):
         with open(json_file_path_, "r") as json_file:
             json_file_content = load(json_file)
 
-        # Print the loaded trust_policy dictionary
-        print(f"Loaded JSON: {json_file_path_}")
+        logger.debug("Loaded JSON: %s", json_file_path_)
 
         return json_file_content
 
@@ -32,6 +44,44 @@ def load_JSON(json_file_path_):
         print(f"Error loading JSON: {e}")
 
 
+@lru_cache(maxsize=8)
+def load_cached_JSON(json_file_path_, modification_time_):
+    """
+    Load JSON data from a file, parsing it only once per file version.
+
+    Parameters:
+    json_file_path_ (str): The path to the JSON file to be loaded.
+    modification_time_ (float): The file modification time, so that edited files are reloaded.
+
+    Returns:
+    dict: The loaded JSON data. It is shared between calls and must not be mutated.
+    """
+
+    return load_JSON(json_file_path_)
+
+
+def load_JSON_once(json_file_path_):
+    """
+    Load JSON data from a file, reusing the parsed content while the file is unchanged.
+
+    Parameters:
+    json_file_path_ (str): The path to the JSON file to be loaded.
+
+    Returns:
+    dict: A copy of the loaded JSON data.
+    """
+
+    # Key the cache by absolute path, so that equivalent relative paths share one entry
+    json_file_path = os_path.abspath(json_file_path_)
+
+    try:
+        modification_time = os_path.getmtime(json_file_path)
+    except OSError:
+        modification_time = None
+
+    return deepcopy(load_cached_JSON(json_file_path, modification_time))
+
+
 def get_trust_policy(trust_policy_folder):
     """
     Get the trust policy from a specified folder.
@@ -43,22 +93,19 @@ def get_trust_policy(trust_policy_folder):
     dict: The trust policy data.
     """
 
-    trust_policy_file_path = trust_policy_folder + "/" + "trust_policy.json"
+    trust_policy_file_path = os_path.join(trust_policy_folder, "trust_policy.json")
 
-    return load_JSON(trust_policy_file_path)
+    return load_JSON_once(trust_policy_file_path)
 
 def get_current_function_folder():
-    from os import path
-    from inspect import currentframe
-
-    # Get the filename of the current frame (function or method)
-    current_frame = currentframe()
-    current_filename = current_frame.f_code.co_filename
-    
-    # Get the directory path of the current filename
-    current_folder = path.dirname(path.abspath(current_filename))
-    
-    return current_folder
+    """
+    Get the folder of this module.
+
+    Returns:
+    str: The absolute path of the folder holding this module.
+    """
+
+    return MODULE_FOLDER
 
 def get_lambda_usage_constraints(usage_constraints_folder):
     """
@@ -73,14 +120,17 @@ def get_lambda_usage_constraints(usage_constraints_folder):
 
     # Rate limits: Harsh since this will be public facing
     # Quota: Low daily limits for the same reason
-    usage_file_path = usage_constraints_folder + "/" + "api_usage_constraints.json"
-    return load_JSON(usage_file_path)
+    usage_file_path = os_path.join(usage_constraints_folder, "api_usage_constraints.json")
+    return load_JSON_once(usage_file_path)
 
 
 def timing(custom_message):
     """
     A decorator function for measuring the execution time of a function.
 
+    The elapsed time is logged at INFO level. The function is returned untouched
+    when the environment variable LAMBDA_API_TIMING is set to 0.
+
     Parameters:
     custom_message (str): A custom message to describe the executed function.
 
@@ -89,36 +139,39 @@ def timing(custom_message):
     """
 
     def decorator(func):
-        def wrapper(*args, **kwargs):
-            from time import time
+        if not TIMING_ENABLED:
+            return func
 
-            # Record the start time
-            start_time = time()
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # Skip the timing and formatting work when nobody listens
+            if not logger.isEnabledFor(logging.INFO):
+                return func(*args, **kwargs)
 
             # Initial message
-            print(f"Starting execution of {custom_message}...")
+            logger.info("Starting execution of %s...", custom_message)
+
+            # Record the start time
+            start_time = perf_counter_ns()
 
             # Call the wrapped function
             result = func(*args, **kwargs)
 
             # Calculate the time spent
-            end_time = time()
-            elapsed_time = end_time - start_time
+            elapsed_time = (perf_counter_ns() - start_time) / 1e9
 
             # Ending message
-            print(f"Finished execution of {custom_message}.")
-            print(f"Time taken: {elapsed_time:.2f} seconds")
+            logger.info("Finished execution of %s.", custom_message)
+            logger.info("Time taken: %.2f seconds", elapsed_time)
 
             return result
         return wrapper
     return decorator
 
 def get_calling_module_folder(calling_module_file):
-    from os import path
-
     # Get the directory path of the calling module
-    abs_path = path.abspath(calling_module_file)
-    calling_module_folder = path.dirname(abs_path)
+    abs_path = os_path.abspath(calling_module_file)
+    calling_module_folder = os_path.dirname(abs_path)
     return calling_module_folder
 
 def handle_aws_errors(func):
@@ -133,15 +186,35 @@ def handle_aws_errors(func):
 
     Returns:
     - The result of the wrapped function or None in case of errors.
+
+    Note:
+    Do not wrap lookups whose None result leads to a creation: a throttled or denied call would
+    then read as "not found" and create a duplicate.
     """
+    @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             result = func(*args, **kwargs)
             return result
         except ClientError as e:
             print(f"An error occurred: {e}")
-            return None, None
+            return None
         except BotoCoreError as e:
             print(f"An AWS SDK error occurred: {e}")
-            return None, None
-    return wrapper
\ No newline at end of file
+            return None
+    return wrapper
+
+def get_error_code(error_):
+    """
+    Get the error code of an AWS SDK error.
+
+    Parameters:
+    - error_ (Exception): The error, typically a `botocore.exceptions.ClientError`.
+
+    Returns:
+    - str: The error code (e.g. 'ConflictException'), or an empty string if there is none.
+    """
+
+    response = getattr(error_, "response", None) or {}
+
+    return response.get("Error", {}).get("Code", "")
@@ -0,0 +1,93 @@
+from json import dump, load, JSONDecodeError
+from os import makedirs, path, replace
+from threading import Lock
+from time import time
+
+from .default_values import DEPLOYMENT_STATE_PATH, DEPLOYMENT_STATE_TTL_SECONDS
+
+# Serializes the read-modify-write cycles of concurrent deployments
+STATE_LOCK = Lock()
+
+def build_state_key(account_id_, region_, rest_api_name_):
+    """
+    Build the key of a deployment in the state file.
+
+    Parameters:
+    account_id_ (str): AWS account ID.
+    region_ (str): AWS region.
+    rest_api_name_ (str): The name of the REST API.
+
+    Returns:
+    str: The deployment state key.
+    """
+
+    return f"{account_id_}/{region_}/{rest_api_name_}"
+
+
+def read_state(state_path_=DEPLOYMENT_STATE_PATH):
+    """
+    Read the persisted deployment state.
+
+    Parameters:
+    state_path_ (str, optional): The path to the state file.
+
+    Returns:
+    dict: The deployment state, or an empty dictionary if there is none (or it is unreadable).
+    """
+
+    try:
+        with open(path.expanduser(state_path_), "r") as state_file:
+            return load(state_file)
+    except (OSError, JSONDecodeError):
+        return {}
+
+
+def get_deployment_state(key_, ttl_seconds_=DEPLOYMENT_STATE_TTL_SECONDS,
+                         state_path_=DEPLOYMENT_STATE_PATH):
+    """
+    Get the persisted state of a deployment, if it is recent enough to be trusted.
+
+    Parameters:
+    key_ (str): The deployment state key (see `build_state_key`).
+    ttl_seconds_ (float, optional): Maximum age of the state, in seconds.
+    state_path_ (str, optional): The path to the state file.
+
+    Returns:
+    dict: The deployment state entry, or None if absent or expired.
+    """
+
+    entry = read_state(state_path_).get(key_)
+
+    if entry is None or time() - entry.get("updated_at", 0) > ttl_seconds_:
+        return None
+
+    return entry
+
+
+def save_deployment_state(key_, entry_, state_path_=DEPLOYMENT_STATE_PATH):
+    """
+    Persist the state of a deployment, replacing its previous entry.
+
+    Parameters:
+    key_ (str): The deployment state key (see `build_state_key`).
+    entry_ (dict): The deployment state entry (e.g. REST API ID).
+    state_path_ (str, optional): The path to the state file.
+    """
+
+    state_file_path = path.expanduser(state_path_)
+
+    with STATE_LOCK:
+        state = read_state(state_path_)
+        state[key_] = {**entry_, "updated_at": time()}
+
+        try:
+            makedirs(path.dirname(state_file_path), exist_ok=True)
+
+            # Write to a temporary file first, so readers never see a partial file
+            temporary_path = state_file_path + ".tmp"
+            with open(temporary_path, "w") as state_file:
+                dump(state, state_file)
+
+            replace(temporary_path, state_file_path)
+        except OSError as e:
+            print(f"Could not save deployment state: {e}")
@@ -7,8 +7,8 @@ in usage.
 
 Functions:
 - model_prediction_map(payload_list, model=None): This function takes a list of payloads as
-input and performs a custom transformation (square_lambda) on each payload element using
-the `map` function. The transformed results are returned as a list.
+input and performs a custom transformation (squaring) on each payload element using
+a list comprehension. The transformed results are returned as a list.
 
 Usage:
 1. Load the model locally:
@@ -36,7 +36,7 @@ ALLOWED_TYPES = (int, float)
 
 def model_prediction_map(payload_list: list):
     """
-    Maps a list of payloads to their squared values using a predefined square lambda function.
+    Maps a list of payloads to their squared values.
 
     Parameters:
     - payload_list (list): A list of payloads to be processed.
@@ -47,10 +47,8 @@ def model_prediction_map(payload_list: list):
 
     # REPLACE WITH: ####################################
     #   - command call model.predict(payload).tolist()
-    def square_lambda(x):
-        return x ** 2
-
-    square_map = map(square_lambda, payload_list)
+    # NOTE: The comprehension avoids a Python function call per element
+    squares = [x * x for x in payload_list]
     ####################################################
 
-    return list(square_map)
+    return squares
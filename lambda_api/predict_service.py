@@ -10,6 +10,7 @@ Functions:
     - validate_body(body: Union[str, dict]) -> Tuple[bool, List[Union[int, float, str]]]: Validate input data.
     - validate_event(event: dict, context: dict) -> dict: Validate the request event, including its body.
     - predict(event: dict, context: dict) -> dict: Handle prediction requests and return responses.
+    - predict_batch(event: dict, context: dict) -> dict: Handle batches of prediction requests in one invocation.
 
 Imports:
     - json.loads and json.dumps from the json module
@@ -30,6 +31,17 @@ from .default_values import DEFAULT_TYPE_ERROR_MESSAGE, \
     CLIENT_ERROR_STATUS_CODE, SUCCESS_STATUS_CODE, SERVER_ERROR_STATUS_CODE
 from .utils import are_types, is_success_status_code
 
+logger = logging.getLogger(__name__)
+
+# First characters of a JSON document accepted by json.loads, NaN and Infinity included
+JSON_START_CHARACTERS = frozenset('{["-0123456789tfnNI')
+
+# Static part of every API response, copied per response
+RESPONSE_TEMPLATE = {
+    "headers": {"Content-Type": "application/json"},
+    "isBase64Encoded": False,
+}
+
 # Function alias for prediction function wrapping
 
 
@@ -60,14 +72,11 @@ def api_return(body: dict, status: int, error: str = "") -> dict:
     Returns:
         dict: The formatted response.
     """
-    response = {
-        "statusCode": status,
-        "headers": {"Content-Type": "application/json"},
-        "body": dumps(body, default=str),
-        "isBase64Encoded": False,
-    }
-
-    if len(error) != 0:
+    response = RESPONSE_TEMPLATE.copy()
+    response["statusCode"] = status
+    response["body"] = dumps(body, default=str)
+
+    if error:
         response["error_message"] = error
 
     return response
@@ -130,6 +139,13 @@ def validate_body(body: Union[str, list, dict]
     is_valid = True
     payload = []
 
+    # Strings that cannot start a JSON document are rejected without going through the JSON parser
+    if isinstance(body, str):
+        document = body.lstrip()
+
+        if not document or document[0] not in JSON_START_CHARACTERS:
+            return False, payload
+
     try:
         body = loads(body) if isinstance(body, str) else body
     except JSONDecodeError:
@@ -229,8 +245,8 @@ def predict(event: dict, context: dict) -> dict:
             response = api_return(prediction_result, status_code)
 
             # Log successful event
-            log_message = f"Successful prediction: {prediction_result}"
-            logging.info(log_message)
+            # NOTE: Lazy formatting skips rendering the prediction when INFO is disabled
+            logger.info("Successful prediction: %s", prediction_result)
 
         except Exception as e:
             # Response error
@@ -243,10 +259,82 @@ def predict(event: dict, context: dict) -> dict:
             response = api_return(prediction_result, status_code, error_msg)
 
             # Log unsuccessful event
-            log_message = f"Unsuccessful prediction: {error_msg}"
-            logging.error(log_message)
+            logger.error("Unsuccessful prediction: %s", error_msg)
 
     else:
         response = payload
 
     return response
+
+# Batched prediction main map
+
+
+def predict_batch(event: dict, context: dict) -> dict:
+    """
+    Handle a batch of prediction requests with a single model call.
+
+    The request body holds a 'batch' list, each entry being a body accepted by validate_body.
+    The payloads are concatenated, predicted at once and split back per entry.
+
+    Args:
+        event (dict): The request event data.
+        context (dict): The Lambda context data.
+
+    Returns:
+        dict: The formatted response with one prediction list per batch entry.
+    """
+    # Initialization
+    is_valid = True
+    prediction_result = []
+
+    # Batch validation
+    body = event["body"]
+
+    try:
+        body = loads(body) if isinstance(body, str) else body
+    except JSONDecodeError:
+        is_valid = False
+
+    batch = body.get("batch") if is_valid and isinstance(body, dict) else None
+    is_valid = isinstance(batch, list)
+
+    payload_list = []
+    lengths = []
+
+    for entry in batch if is_valid else []:
+        is_valid, payload = validate_body(entry)
+
+        if not is_valid:
+            break
+
+        payload_list.extend(payload)
+        lengths.append(len(payload))
+
+    if not is_valid:
+        return api_return([], CLIENT_ERROR_STATUS_CODE, DEFAULT_TYPE_ERROR_MESSAGE)
+
+    try:
+        # Prediction, with a single model call for the whole batch
+        predictions = make_prediction(payload_list)
+
+        # Split the predictions back per batch entry
+        offset = 0
+        for length in lengths:
+            prediction_result.append(predictions[offset:offset + length])
+            offset += length
+
+        response = api_return(prediction_result, SUCCESS_STATUS_CODE)
+
+        # Log successful event
+        logger.info("Successful batch prediction: %s", prediction_result)
+
+    except Exception as e:
+        # Response error
+        error_msg = str(e)
+
+        response = api_return([], SERVER_ERROR_STATUS_CODE, error_msg)
+
+        # Log unsuccessful event
+        logger.error("Unsuccessful batch prediction: %s", error_msg)
+
+    return response
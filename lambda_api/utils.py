@@ -18,8 +18,6 @@ Functions:
             bool: True if all elements in 'candidate' are instances of the specified types, otherwise False.
 """
 
-from functools import reduce
-
 
 def are_types(candidate: list, types: tuple) -> bool:
     """
@@ -32,10 +30,8 @@ def are_types(candidate: list, types: tuple) -> bool:
     Returns:
         bool: True if all elements in 'candidate' are instances of the specified types, otherwise False.
     """
-    def is_types_map(is_types_acc, x):
-        return is_types_acc and isinstance(x, types)
-
-    return reduce(is_types_map, candidate)
+    # NOTE: all() stops at the first element of another type
+    return all(isinstance(x, types) for x in candidate)
 
 
 def is_success_status_code(status_code: int) -> bool:
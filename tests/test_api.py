@@ -1,7 +1,11 @@
+from math import isnan
 from unittest.mock import patch
 
+import pytest
+
 from lambda_api.predict_service import make_prediction, \
     predict, \
+    predict_batch, \
     api_return, \
     validate_data, \
     validate_body, \
@@ -134,48 +138,22 @@ def test_api_return():
     }
 
 
-@patch("lambda_api.predict_service.ALLOWED_TYPES", MOCKED_ALLOWED_TYPES)
-def test_validate_data_valid_list():
+@pytest.mark.parametrize("data, expected_valid, expected_payload", [
     # Valid list input
-    data = [1, 2, 3]
-
-    is_valid, payload = validate_data(data)
-
-    assert is_valid is True
-    assert payload == data
-
-
-@patch("lambda_api.predict_service.ALLOWED_TYPES", MOCKED_ALLOWED_TYPES)
-def test_validate_data_valid_single_value():
+    ([1, 2, 3], True, [1, 2, 3]),
     # Valid single value input
-    data = 42
-
-    is_valid, payload = validate_data(data)
-
-    assert is_valid is True
-    assert payload == [data]
-
-
-@patch("lambda_api.predict_service.ALLOWED_TYPES", MOCKED_ALLOWED_TYPES)
-def test_validate_data_invalid_type():
+    (42, True, [42]),
     # Invalid input type
-    data = "invalid"
-
-    is_valid, payload = validate_data(data)
-
-    assert is_valid is False
-    assert payload == []
-
-
-@patch("lambda_api.predict_service.ALLOWED_TYPES", MOCKED_ALLOWED_TYPES)
-def test_validate_data_invalid_list():
+    ("invalid", False, []),
     # Invalid list input
-    data = ["invalid", "data"]
-
+    (["invalid", "data"], False, []),
+], ids=lambda p: repr(p)[:20])
+@patch("lambda_api.predict_service.ALLOWED_TYPES", MOCKED_ALLOWED_TYPES)
+def test_validate_data(data, expected_valid, expected_payload):
     is_valid, payload = validate_data(data)
 
-    assert is_valid is False
-    assert payload == []
+    assert is_valid is expected_valid
+    assert payload == expected_payload
 
 
 @patch("lambda_api.predict_service.ALLOWED_TYPES", MOCKED_ALLOWED_TYPES)
@@ -189,84 +167,115 @@ def test_validate_data_custom_list_check():
     assert is_valid is False
     assert payload == []
 
-# Test case for a valid JSON string with 'data' key
-
-
-def test_validate_body_json():
-    body = '{"data": [1, 2, 3]}'
+# Test cases for validate_body function
+
+
+@pytest.mark.parametrize("body, expected_valid, expected_payload", [
+    # Valid JSON string with 'data' key
+    ('{"data": [1, 2, 3]}', True, [1, 2, 3]),
+    # Valid list
+    ([1, 2, 3], True, [1, 2, 3]),
+    # Single valid type
+    (42, True, [42]),
+    # Invalid JSON string
+    ('{"invalid_data": 42}', False, []),
+    # Invalid list with mixed types
+    ([1, "two", 3.0], False, []),
+    # Invalid type (set)
+    ({"key": "value"}, False, []),
+    # Empty string
+    ("", False, []),
+    # Blank string, rejected before parsing
+    ("   ", False, []),
+    # Leading whitespace still parses
+    ("  [1, 2]", True, [1, 2]),
+    # String that cannot start a JSON document, rejected before parsing
+    ("invalid_data", False, []),
+    # Infinity is accepted by json.loads, so the prefilter lets it through
+    ("Infinity", True, [float("inf")]),
+], ids=lambda p: repr(p)[:20])
+def test_validate_body(body, expected_valid, expected_payload):
     is_valid, payload = validate_body(body)
-    assert is_valid is True
-    assert payload == [1, 2, 3]
-
-# Test case for a valid list
-
 
-def test_validate_body_list():
-    body = [1, 2, 3]
-    is_valid, payload = validate_body(body)
-    assert is_valid is True
-    assert payload == [1, 2, 3]
+    assert is_valid is expected_valid
+    assert payload == expected_payload
 
-# Test case for a single valid type
+# Test case for a NaN body, which the prefilter lets through like json.loads
 
 
-def test_validate_body_single_type():
-    body = 42
-    is_valid, payload = validate_body(body)
+def test_validate_body_nan():
+    is_valid, payload = validate_body("NaN")
     assert is_valid is True
-    assert payload == [42]
+    assert len(payload) == 1 and isnan(payload[0])
 
-# Test case for an invalid JSON string
+# Test case for validate_event function
 
 
-def test_validate_body_invalid_json():
-    body = '{"invalid_data": 42}'
-    is_valid, payload = validate_body(body)
-    assert is_valid is False
-    assert payload == []
+@pytest.mark.parametrize("body, expected_status", [
+    # Valid JSON string in the event body
+    ('{"data": [1, 2, 3]}', SUCCESS_STATUS_CODE),
+    # Valid list in the event body
+    ([1, 2, 3], SUCCESS_STATUS_CODE),
+    # Invalid event body
+    ("invalid_data", CLIENT_ERROR_STATUS_CODE),
+], ids=lambda p: repr(p)[:20])
+def test_validate_event(body, expected_status):
+    event = {"body": body}
+    response = validate_event(event, {})
+    assert response["statusCode"] == expected_status
 
-# Test case for an invalid list with mixed types
+# Test cases for predict_batch function
 
 
-def test_validate_body_invalid_list():
-    body = [1, "two", 3.0]
-    is_valid, payload = validate_body(body)
-    assert is_valid is False
-    assert payload == []
+def test_predict_batch():
+    # Batch with a list, a single value and a 'data' dictionary
+    event = {"body": '{"batch": [[1, 2], 3, {"data": [4]}]}'}
+    response = predict_batch(event, {})
 
-# Test case for an invalid type (set)
+    assert response == {
+        "statusCode": SUCCESS_STATUS_CODE,
+        "headers": {"Content-Type": "application/json"},
+        "body": "[[1, 4], [9], [16]]",
+        "isBase64Encoded": False
+    }
 
 
-def test_validate_body_invalid_type():
-    body = {"key": "value"}
-    is_valid, payload = validate_body(body)
-    assert is_valid is False
-    assert payload == []
+@patch("lambda_api.predict_service.model_prediction_map")
+def test_predict_batch_single_model_call(mock_model_prediction_map):
+    mock_model_prediction_map.return_value = [1, 4, 9]
 
-# Test case for an empty string
+    event = {"body": {"batch": [[1], [2, 3]]}}
+    response = predict_batch(event, {})
 
+    mock_model_prediction_map.assert_called_once_with([1, 2, 3])
+    assert response["body"] == "[[1], [4, 9]]"
 
-def test_validate_body_empty_string():
-    body = ""
-    is_valid, payload = validate_body(body)
-    assert is_valid is False
-    assert payload == []
 
-# Test case for validate_event function
+@pytest.mark.parametrize("body", [
+    # Missing 'batch' key
+    '{"data": [1]}',
+    # Invalid entry
+    '{"batch": [[1], ["two"]]}',
+    # Invalid JSON string
+    "invalid",
+], ids=lambda p: repr(p)[:20])
+def test_predict_batch_invalid(body):
+    response = predict_batch({"body": body}, {})
 
+    assert response["statusCode"] == CLIENT_ERROR_STATUS_CODE
+    assert response["body"] == "[]"
 
-def test_validate_event():
-    # Test with valid JSON string in the event body
-    event = {"body": '{"data": [1, 2, 3]}'}
-    response = validate_event(event, {})
-    assert response["statusCode"] == SUCCESS_STATUS_CODE
 
-    # Test with valid list in the event body
-    event = {"body": [1, 2, 3]}
-    response = validate_event(event, {})
-    assert response["statusCode"] == SUCCESS_STATUS_CODE
+@patch("lambda_api.predict_service.model_prediction_map",
+       side_effect=ValueError("Prediction failed"))
+def test_predict_batch_error_handling(mock_model_prediction_map):
+    # A failing model call answers the whole batch with a server error
+    response = predict_batch({"body": '{"batch": [[1], [2, 3]]}'}, {})
 
-    # Test with invalid event body
-    event = {"body": "invalid_data"}
-    response = validate_event(event, {})
-    assert response["statusCode"] == CLIENT_ERROR_STATUS_CODE
+    assert response == {
+        "statusCode": SERVER_ERROR_STATUS_CODE,
+        "headers": {"Content-Type": "application/json"},
+        "body": "[]",
+        "isBase64Encoded": False,
+        "error_message": "Prediction failed",
+    }
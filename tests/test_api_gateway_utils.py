@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+
+from botocore.exceptions import ClientError  # noqa: E402
+from botocore.stub import Stubber  # noqa: E402
+
+from deploy.utils.api_gateway_utils import deploy_rest_api, get_rest_api_id_by_name  # noqa: E402
+
+
+def make_stubbed_client():
+    # A fresh client per test: the REST API listing is cached per client
+    g_client = boto3.client(
+        "apigateway",
+        region_name="us-east-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+    )
+
+    return g_client, Stubber(g_client)
+
+
+# Test case for a failed REST API listing: it must not read as "not found"
+def test_get_rest_api_id_by_name_error():
+    g_client, stubber = make_stubbed_client()
+    stubber.add_client_error("get_rest_apis", service_error_code="TooManyRequestsException")
+
+    with stubber, pytest.raises(ClientError):
+        get_rest_api_id_by_name(g_client, "my-api")
+
+    stubber.assert_no_pending_responses()
+
+
+# Test case for a missing REST API: None is kept for "not found"
+def test_get_rest_api_id_by_name_not_found():
+    g_client, stubber = make_stubbed_client()
+    stubber.add_response("get_rest_apis", {"items": [{"id": "abc123", "name": "other-api"}]})
+
+    with stubber:
+        assert get_rest_api_id_by_name(g_client, "my-api") is None
+
+
+# Test case for a failed REST API lookup on deploy: no duplicate API is created
+@patch("deploy.utils.api_gateway_utils.create_rest_api")
+@patch("deploy.utils.api_gateway_utils.create_api_key", return_value=("key-id", "key-value"))
+def test_deploy_rest_api_lookup_error(mock_create_api_key, mock_create_rest_api):
+    g_client, stubber = make_stubbed_client()
+    stubber.add_client_error("get_rest_apis", service_error_code="AccessDeniedException")
+
+    with stubber, pytest.raises(ClientError):
+        deploy_rest_api(
+            g_client, "123456789012", "us-east-1",
+            "arn:aws:lambda:us-east-1:123456789012:function:my-function",
+            "my-api", "predict", "POST", "prod", {},
+        )
+
+    mock_create_rest_api.assert_not_called()
+    stubber.assert_no_pending_responses()
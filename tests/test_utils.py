@@ -1,4 +1,4 @@
-from lambda_api.utils import is_fail_status_code, is_success_status_code
+from lambda_api.utils import are_types, is_fail_status_code, is_success_status_code
 
 
 def test_is_fail_status_code():
@@ -43,3 +43,21 @@ def test_is_success_status_code():
 
     # Test edge case: upper bound of the range (299)
     assert is_success_status_code(299) is True
+
+
+def test_are_types():
+    """
+    Test cases for the are_types function.
+    """
+    # Test lists with only allowed types
+    assert are_types([1, 2.0, 3], (int, float)) is True
+    assert are_types([1], (int, float)) is True
+
+    # Test lists with at least one disallowed type
+    assert are_types([1, "two", 3.0], (int, float)) is False
+
+    # Test edge case: the first element is of a disallowed type
+    assert are_types(["one", 2, 3], (int, float)) is False
+
+    # Test edge case: empty list
+    assert are_types([], (int, float)) is True